@@ -7,13 +7,23 @@
 
 from __future__ import annotations
 
+import functools
+import importlib
 import os
+import re
+import signal
 import sys
-import subprocess
 import ctypes
 import shutil
+import traceback
+import unicodedata
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
+
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
 
 from clear_output_cache import clear_output_cache
 from config_manager import load_config, save_config, get_posts_dir
@@ -23,16 +33,20 @@ from file_manager import (
     list_output_files,
     list_markdown_files,
     make_output_stem,
+    build_md_index,
+    lookup_md_index,
+    dir_stamp,
     resolve_md_path,
+    preload_text_files,
     replace_sentence_in_file,
+    flush_text_cache,
     check_sentence_in_file,
 )
 from data_parser import (
     split_label,
     parse_label,
     parse_ai_json,
-    load_change_out,
-    load_filtered_change_lines,
+    load_change_data,
 )
 
 
@@ -49,42 +63,117 @@ ANSI_GREEN = "\x1b[32m"
 ANSI_RED = "\x1b[31m"
 ANSI_GRAY = "\x1b[90m"
 
+# 审查进度每处理多少条写入一次磁盘（切换文件、退出时也会写入）
+PROGRESS_SAVE_INTERVAL = 16
+
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*[A-Za-z]")
+
+
+# 终端是否能解析 ANSI 控制序列；Windows 下需开启 VT 模式成功后才置为 True
+_vt_enabled = os.name != "nt"
+
 
 def _enable_vt_mode() -> None:
+    global _vt_enabled
     if os.name != "nt":
         return
     try:
-        handle = ctypes.windll.kernel32.GetStdHandle(-11)
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
         mode = ctypes.c_uint32()
-        if ctypes.windll.kernel32.GetConsoleMode(handle, ctypes.byref(mode)) == 0:
+        if kernel32.GetConsoleMode(handle, ctypes.byref(mode)) == 0:
             return
         ENABLE_VIRTUAL_TERMINAL_PROCESSING = 0x0004
         new_mode = mode.value | ENABLE_VIRTUAL_TERMINAL_PROCESSING
-        ctypes.windll.kernel32.SetConsoleMode(handle, new_mode)
+        if kernel32.SetConsoleMode(handle, new_mode) != 0:
+            _vt_enabled = True
     except Exception:
         return
 
 
-def _supports_color() -> bool:
-    if not sys.stdout.isatty():
+@functools.lru_cache(maxsize=1)
+def _is_tty() -> bool:
+    return sys.stdout.isatty()
+
+
+def _supports_color_uncached() -> bool:
+    if not _is_tty():
         return False
     if os.environ.get("NO_COLOR"):
         return False
     return True
 
 
+@functools.lru_cache(maxsize=1)
+def _supports_color() -> bool:
+    # 终端能力在进程生命周期内不会改变，只检测一次
+    return _supports_color_uncached()
+
+
 def _style(text: str, *codes: str) -> str:
-    if not _supports_color() or not codes:
+    if not codes or not _supports_color():
         return text
     return "".join(codes) + text + ANSI_RESET
 
 
-def _term_width() -> int:
+_cached_term_size: Optional[os.terminal_size] = None
+# 没有 SIGWINCH 的平台（Windows）收不到尺寸变化通知
+_HAS_SIGWINCH = hasattr(signal, "SIGWINCH")
+
+
+def _refresh_term_size() -> os.terminal_size:
+    global _cached_term_size
     try:
-        width = shutil.get_terminal_size().columns
+        _cached_term_size = shutil.get_terminal_size()
     except OSError:
-        width = 80
-    return max(60, min(width, 100))
+        _cached_term_size = os.terminal_size((80, 24))
+    return _cached_term_size
+
+
+def _clamp_term_width(columns: int) -> int:
+    return max(60, min(columns, 100))
+
+
+def _refresh_term_width() -> int:
+    return _clamp_term_width(_refresh_term_size().columns)
+
+
+def _current_term_size() -> os.terminal_size:
+    # 尺寸只在进入菜单或收到 SIGWINCH 后重新读取，其余时候直接用缓存；
+    # 没有 SIGWINCH 时无法得知尺寸变化，只能每次重新读取
+    if _cached_term_size is None or not _HAS_SIGWINCH:
+        return _refresh_term_size()
+    return _cached_term_size
+
+
+def _term_width() -> int:
+    if _cached_term_size is None:
+        return _refresh_term_width()
+    return _clamp_term_width(_cached_term_size.columns)
+
+
+def _on_resize(signum, frame) -> None:
+    global _cached_term_size
+    _cached_term_size = None
+
+
+def _watch_resize() -> None:
+    # Windows 没有 SIGWINCH，依赖每次进入菜单时刷新
+    if _HAS_SIGWINCH:
+        signal.signal(signal.SIGWINCH, _on_resize)
+
+
+def _display_width(text: str) -> int:
+    # 全角/宽字符在终端中占两列
+    return sum(
+        2 if unicodedata.east_asian_width(ch) in ("W", "F") else 1
+        for ch in _ANSI_ESCAPE_RE.sub("", text)
+    )
+
+
+def _screen_rows(line: str, columns: int) -> int:
+    # 一行文本在终端中自动换行后占用的行数
+    return max(1, -(-_display_width(line) // columns))
 
 
 def _hr(width: Optional[int] = None) -> str:
@@ -92,50 +181,199 @@ def _hr(width: Optional[int] = None) -> str:
     return "-" * line_width
 
 
-def _render_header(title: str) -> None:
-    width = _term_width()
+@functools.lru_cache(maxsize=8)
+def _styled_hr(width: int) -> str:
+    # 颜色支持在进程内不变，同一宽度的分隔线只生成一次
+    return _style(_hr(width), ANSI_GRAY)
+
+
+@functools.lru_cache(maxsize=32)
+def _format_header_cached(title: str, width: int) -> str:
     label = f"[ {title} ]"
     if len(label) > width:
         label = label[: max(0, width - 1)]
-    print(_style(label.center(width), ANSI_BOLD, ANSI_CYAN))
-    print(_style(_hr(width), ANSI_GRAY))
+    return (
+        _style(label.center(width), ANSI_BOLD, ANSI_CYAN) + "\n"
+        + _styled_hr(width) + "\n"
+    )
 
 
-def _render_footer(text: str) -> None:
+def _format_header(title: str, width: Optional[int] = None) -> str:
+    return _format_header_cached(title, width or _term_width())
+
+
+def _format_footer(text: str) -> str:
     if not text:
-        return
-    print()
-    print(_style(text, ANSI_DIM, ANSI_GRAY))
+        return ""
+    return "\n" + _style(text, ANSI_DIM, ANSI_GRAY) + "\n"
+
+
+def _render_header(title: str, width: Optional[int] = None) -> None:
+    sys.stdout.write(_format_header(title, width))
+
+
+def _render_footer(text: str) -> None:
+    sys.stdout.write(_format_footer(text))
 
 
 POSTS_DIR = get_posts_dir()
 
+# 文件名 -> 路径列表 的索引，按需建立，POSTS_DIR 变化时失效
+_filename_index: Optional[Dict[str, List[Path]]] = None
+
+
+# 目录列表缓存：键 -> (涉及的目录, 目录 mtime 快照, 文件列表)
+_listing_cache: Dict[str, Tuple[List[str], Optional[Tuple[int, ...]], List[Path]]] = {}
+
+
+def _cached_listing(key: str) -> Optional[List[Path]]:
+    entry = _listing_cache.get(key)
+    if entry is None:
+        return None
+    dirs, stamp, files = entry
+    if stamp is None or dir_stamp(dirs) != stamp:
+        return None
+    return list(files)
+
+
+def cached_markdown_files() -> List[Path]:
+    """
+    列出 POSTS_DIR 中的 Markdown 文件，目录未变化时直接复用上次的结果
+
+    只需 stat 各个目录即可判断是否变化，无需重新遍历所有文件
+    """
+    key = f"md:{POSTS_DIR}"
+    files = _cached_listing(key)
+    if files is None:
+        dirs: List[str] = []
+        files = list_markdown_files(POSTS_DIR, dirs)
+        _listing_cache[key] = (dirs, dir_stamp(dirs), files)
+        files = list(files)
+    return files
+
+
+def cached_output_files(pattern: str = "*.txt") -> List[Path]:
+    """
+    列出 output 目录中的文件，目录未变化时直接复用上次的结果
+    """
+    key = f"out:{pattern}"
+    files = _cached_listing(key)
+    if files is None:
+        dirs = [str(ensure_output_dir())]
+        files = list_output_files(pattern)
+        _listing_cache[key] = (dirs, dir_stamp(dirs), files)
+        files = list(files)
+    return files
+
+
+def invalidate_output_listing() -> None:
+    for key in [k for k in _listing_cache if k.startswith("out:")]:
+        del _listing_cache[key]
+
+
+def _get_filename_index(refresh: bool = False) -> Dict[str, List[Path]]:
+    """
+    获取 POSTS_DIR 的文件名索引，整个目录只遍历一次
+
+    Args:
+        refresh: 为 True 时重新遍历目录
+
+    Returns:
+        以文件名为键、同名文件路径列表为值的字典
+    """
+    global _filename_index
+    if _filename_index is None or refresh:
+        _filename_index = build_md_index(POSTS_DIR)
+    return _filename_index
+
+
+_CLEAR_SEQ = "\x1b[2J\x1b[H"
+
 
 def clear_screen() -> None:
+    # VT 模式开启后直接输出 ANSI 清屏序列，无需启动 cmd.exe；
+    # 开启失败时才回退到 cls
+    if _is_tty() and _vt_enabled:
+        sys.stdout.write(_CLEAR_SEQ)
+        sys.stdout.flush()
+        return
     os.system("cls")
 
 
+def _write_frame(parts: List[str]) -> None:
+    """
+    清屏并把整帧内容拼接后一次性写出，每次重绘只产生一次 write
+    """
+    if _is_tty() and _vt_enabled:
+        sys.stdout.write(_CLEAR_SEQ + "".join(parts))
+    else:
+        clear_screen()
+        sys.stdout.write("".join(parts))
+    sys.stdout.flush()
+
+
+# 方向键以 0x00/0xE0 开头，第二个字节表示具体按键
+_ARROW_KEYS = {b"H": "up", b"P": "down"}
+_SINGLE_KEYS = {
+    b"\r": "enter",
+    b"q": "quit",
+    b"Q": "quit",
+    b"c": "clear",
+    b"C": "clear",
+}
+
+
 def read_key() -> str:
-    try:
-        import msvcrt
-    except ImportError:
+    if msvcrt is None:
         return ""
 
     ch = msvcrt.getch()
     if ch in (b"\x00", b"\xe0"):
-        ch2 = msvcrt.getch()
-        if ch2 == b"H":
-            return "up"
-        if ch2 == b"P":
-            return "down"
-        return ""
-    if ch == b"\r":
-        return "enter"
-    if ch in (b"q", b"Q"):
-        return "quit"
-    if ch in (b"c", b"C"):
-        return "clear"
-    return ""
+        return _ARROW_KEYS.get(msvcrt.getch(), "")
+    return _SINGLE_KEYS.get(ch, "")
+
+
+_OPTION_PAD = " " * 2
+
+
+def _truncate_option(option: str, width: int) -> str:
+    # 左侧留白与选中标记 "> " 各占两列
+    max_width = max(10, width - len(_OPTION_PAD) - 2)
+    if len(option) > max_width:
+        return option[: max(0, max_width - 3)] + "..."
+    return option
+
+
+def _format_option(text: str, is_active: bool) -> str:
+    prefix = "> " if is_active else "  "
+    label = _style(text, ANSI_REVERSE) if is_active else text
+    return f"{_OPTION_PAD}{prefix}{label}"
+
+
+def _layout_option_rows(
+        head: str,
+        option_lines: List[str],
+        tail: str,
+        size: os.terminal_size,
+) -> Optional[Tuple[List[int], int]]:
+    """
+    计算每个选项在屏幕上的起始行号（从 1 开始）以及整帧结束后的光标行
+
+    整帧超出终端高度时会发生滚动，无法按行号定位，返回 None
+    """
+    columns = max(1, size.columns)
+    row = 1
+    for line in head.split("\n")[:-1]:
+        row += _screen_rows(line, columns)
+    option_rows = []
+    for line in option_lines:
+        option_rows.append(row)
+        row += _screen_rows(line, columns)
+    for line in tail.split("\n")[:-1]:
+        row += _screen_rows(line, columns)
+    if row > size.lines:
+        return None
+    return option_rows, row
 
 
 def menu(
@@ -147,26 +385,53 @@ def menu(
     if not options:
         return None
 
-    _enable_vt_mode()
     index = 0
-    width = _term_width()
-    left_pad = " " * 2
+    width = _refresh_term_width()
+    head = _format_header(title, width) + "\n"
+    tail = _format_footer(footer)
+    # 截断结果只在宽度变化时重新计算
+    texts = [_truncate_option(o, width) for o in options]
+    can_patch = _is_tty() and _vt_enabled
+    layout: Optional[Tuple[List[int], int]] = None
+    drawn_index = -1
+    drawn_size: Optional[os.terminal_size] = None
     while True:
-        clear_screen()
-        _render_header(title)
-        print()
-        for i, option in enumerate(options):
-            is_active = i == index
-            prefix = "> " if is_active else "  "
-            max_width = max(10, width - len(left_pad) - len(prefix))
-            text = option
-            if len(text) > max_width:
-                text = text[: max(0, max_width - 3)] + "..."
-            label = _style(text, ANSI_REVERSE) if is_active else text
-            line = f"{prefix}{label}"
-            print(left_pad + line)
-        if footer:
-            _render_footer(footer)
+        size = _current_term_size()
+        if size != drawn_size and drawn_size is not None:
+            # 终端尺寸变化后按新宽度重新生成标题和截断的选项
+            new_width = _clamp_term_width(size.columns)
+            if new_width != width:
+                width = new_width
+                head = _format_header(title, width) + "\n"
+                texts = [_truncate_option(o, width) for o in options]
+        # 只有首次绘制、终端尺寸变化或无法局部重绘时才整帧重绘；
+        # 未识别的按键不改变任何状态，什么都不输出
+        if (drawn_size is None or size != drawn_size
+                or (layout is None and index != drawn_index)):
+            # 清屏与整帧内容一起写出，避免逐行 print
+            lines = [_format_option(t, i == index)
+                     for i, t in enumerate(texts)]
+            frame = [head]
+            frame.extend(line + "\n" for line in lines)
+            frame.append(tail)
+            _write_frame(frame)
+            layout = _layout_option_rows(
+                head, lines, tail, size) if can_patch else None
+            drawn_size = size
+        elif index != drawn_index:
+            # 只重绘高亮发生变化的两行
+            option_rows, end_row = layout
+            patch = []
+            for i in (drawn_index, index):
+                line = _format_option(texts[i], i == index)
+                row = option_rows[i]
+                rows = _screen_rows(line, max(1, size.columns))
+                patch.extend(f"\x1b[{row + k};1H\x1b[2K" for k in range(rows))
+                patch.append(f"\x1b[{row};1H{line}")
+            patch.append(f"\x1b[{end_row};1H")
+            sys.stdout.write("".join(patch))
+            sys.stdout.flush()
+        drawn_index = index
 
         key = read_key()
         if key == "up":
@@ -181,12 +446,32 @@ def menu(
             return -2
 
 
-def run_script(args: List[str]) -> int:
-    result = subprocess.run(
-        [sys.executable] + args,
-        cwd=str(BASE_DIR),
-    )
-    return result.returncode
+def run_module(module_name: str, argv: Optional[List[str]] = None) -> int:
+    """
+    在当前进程中调用辅助脚本的 main()，省去启动新解释器的开销
+
+    Returns:
+        与独立运行脚本时一致的退出码
+    """
+    cwd = os.getcwd()
+    try:
+        main_func = importlib.import_module(module_name).main
+        code = main_func() if argv is None else main_func(argv)
+    except SystemExit as exc:
+        code = exc.code
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    finally:
+        # 部分脚本会切换工作目录，运行结束后恢复
+        os.chdir(cwd)
+
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
 
 
 def wait_for_key(message: str = "按任意键继续...") -> None:
@@ -195,17 +480,24 @@ def wait_for_key(message: str = "按任意键继续...") -> None:
     read_key()
 
 
-def resolve_md_path_cli(filename: str, cache: Dict[str, Path]) -> Optional[Path]:
+def resolve_md_path_cli(
+        filename: str,
+        cache: Dict[str, Path],
+        index: Optional[Dict[str, List[Path]]] = None,
+) -> Optional[Path]:
     """
     CLI 特有的 Markdown 路径解析函数，包含用户交互
     """
+    if index is None:
+        index = _get_filename_index()
+
     # 先尝试使用通用的解析函数
-    path = resolve_md_path(filename, POSTS_DIR, cache)
+    path = resolve_md_path(filename, POSTS_DIR, cache, index)
     if path:
         return path
 
-    # 如果有多个匹配项，让用户选择
-    matches = [p for p in POSTS_DIR.rglob(filename) if p.is_file()]
+    # 如果有多个匹配项，让用户选择（直接查索引，不再遍历目录）
+    matches = lookup_md_index(index, filename)
     if len(matches) > 1:
         print("发现多个同名文件，请选择：")
         for i, p in enumerate(matches, start=1):
@@ -245,8 +537,7 @@ def mode_changed_files() -> None:
     change_path = output_dir / "changes.txt"
     change_out_path = output_dir / "changes_out.txt"
 
-    rc = run_script([
-        str(BASE_DIR / "checker_add.py"),
+    rc = run_module("checker_add", [
         str(POSTS_DIR),
         "-o",
         str(change_path),
@@ -256,8 +547,7 @@ def mode_changed_files() -> None:
         wait_for_key()
         return
 
-    rc = run_script([
-        str(BASE_DIR / "checker_ai.py"),
+    rc = run_module("checker_ai", [
         str(change_path),
         str(change_out_path),
     ])
@@ -274,7 +564,7 @@ def mode_single_file() -> None:
     # 清除旧的审查进度
     clear_review_progress()
 
-    files = list_markdown_files(POSTS_DIR)
+    files = cached_markdown_files()
     if not files:
         clear_screen()
         _render_header("模式 2：选择一个 Markdown 文件")
@@ -302,8 +592,7 @@ def mode_single_file() -> None:
     print(_style(f"选择: {selected_file}", ANSI_GRAY))
     print()
 
-    rc = run_script([
-        str(BASE_DIR / "checker_process_markdown.py"),
+    rc = run_module("checker_process_markdown", [
         str(selected_file),
         str(temp_file),
     ])
@@ -312,8 +601,7 @@ def mode_single_file() -> None:
         wait_for_key()
         return
 
-    rc = run_script([
-        str(BASE_DIR / "checker_ai.py"),
+    rc = run_module("checker_ai", [
         str(temp_file),
         str(out_file),
     ])
@@ -327,7 +615,7 @@ def mode_single_file() -> None:
 
 
 def mode_review_changes() -> None:
-    output_files = list_output_files("*.txt")
+    output_files = cached_output_files("*.txt")
     if not output_files:
         clear_screen()
         _render_header("模式 3：用户审查修改")
@@ -335,11 +623,16 @@ def mode_review_changes() -> None:
         wait_for_key()
         return
 
-    change_options = [
-        p.name
-        for p in output_files
-        if "_out" not in p.stem
-    ]
+    # 单次遍历把文件分为待处理文件和 AI 结果文件
+    change_candidates: List[Path] = []
+    out_candidates: List[Path] = []
+    for p in output_files:
+        if p.name.endswith("_out.txt"):
+            out_candidates.append(p)
+        else:
+            change_candidates.append(p)
+
+    change_options = [p.name for p in change_candidates]
     selected_change_index = menu(
         "模式 3：选择 Markdown 处理文件（change.txt 或 filename.txt）",
         change_options,
@@ -348,13 +641,9 @@ def mode_review_changes() -> None:
     if selected_change_index is None:
         return
 
-    change_path = output_files[selected_change_index]
+    change_path = change_candidates[selected_change_index]
 
-    change_out_candidates = [
-        p for p in output_files if p.name.endswith("_out.txt")
-    ]
-    if not change_out_candidates:
-        change_out_candidates = output_files
+    change_out_candidates = out_candidates or output_files
 
     change_out_options = [p.name for p in change_out_candidates]
     selected_out_index = menu(
@@ -373,14 +662,13 @@ def mode_review_changes() -> None:
     print(_style(f"change_out.txt: {change_out_path}", ANSI_GRAY))
     print()
 
-    change_out_data = load_change_out(change_out_path)
+    change_out_data, filtered_lines = load_change_data(
+        change_path, change_out_path)
     if not change_out_data:
         print(_style("change_out.txt 中没有可处理的内容", ANSI_YELLOW))
         wait_for_key()
         return
 
-    filtered_lines = load_filtered_change_lines(
-        change_path, set(change_out_data.keys()))
     if not filtered_lines:
         print(_style("change.txt 中没有匹配到 change_out.txt 的标签", ANSI_YELLOW))
         wait_for_key()
@@ -389,146 +677,204 @@ def mode_review_changes() -> None:
     total_lines = len(filtered_lines)
 
     progress_change, progress_out, progress_index = load_review_progress()
-    change_path_resolved = str(change_path.resolve())
-    change_out_path_resolved = str(change_out_path.resolve())
+    # 只解析一次路径，之后保存进度时直接使用，保证与加载时比较的值一致
+    change_path_resolved = change_path.resolve()
+    change_out_path_resolved = change_out_path.resolve()
     start_index = 0
-    if progress_change == change_path_resolved and progress_out == change_out_path_resolved:
+    if (progress_change == str(change_path_resolved)
+            and progress_out == str(change_out_path_resolved)):
         if 0 <= progress_index < len(filtered_lines):
             start_index = progress_index
         else:
             clear_review_progress()
     else:
-        save_review_progress(change_path, change_out_path, 0)
+        save_review_progress(change_path_resolved, change_out_path_resolved, 0)
 
     md_cache: Dict[str, Path] = {}
-    failed_pairs: List[Tuple[str, str]] = []
-    for idx in range(start_index, len(filtered_lines)):
-        label, sentence = filtered_lines[idx]
-
-        ai_info = change_out_data.get(label, {})
-        original_text = ai_info.get("original_text") or sentence
-        error_type = ai_info.get("error_type", "")
-        description = ai_info.get("description", "")
-        checked_text = ai_info.get("checked_text") or ai_info.get("raw", "")
-
-        # 1. 解析标签并定位文件
-        _, filename = parse_label(label)
-        md_path = None
-        if filename:
-            md_path = resolve_md_path_cli(filename, md_cache)
-
-        # 2. 预检查句子是否存在于文件中
-        exists = False
-        if md_path:
-            exists = check_sentence_in_file(md_path, sentence)
-
-        # 3. 如果没找到，直接跳过并记录
-        if not exists:
-            change_line = f"{label}{sentence}"
-            raw_out = ai_info.get("raw") or ai_info.get("checked_text") or ""
-            out_line = f"{label}{raw_out}" if raw_out else label
-            failed_pairs.append((change_line, out_line))
-            save_review_progress(change_path, change_out_path, idx + 1)
-            continue
-
-        # 4. 只有存在时才让用户审查
-        clear_screen()
-        _render_header("模式 3：用户审查修改")
-        print(_style(f"进度: {idx + 1}/{total_lines}", ANSI_GREEN))
-        print(_style("Enter 应用 AI 建议 | Ctrl+P 跳过不修改 | 输入新句子并回车确认 | Q 退出并保存进度", ANSI_GRAY))
-        print()
-
-        print(_style(_hr(), ANSI_GRAY))
-        print(f"文件: {md_path}")
-        print(_style(_hr(), ANSI_GRAY))
-        print(f"原句: {original_text}")
-        if error_type:
-            print(_style(f"错误类型: {error_type}", ANSI_YELLOW))
-        if description:
-            print(_style(f"说明: {description}", ANSI_CYAN))
-        print(f"建议: {checked_text}")
-        print(_style(_hr(), ANSI_GRAY))
-        print("输入修改后的句子，直接回车应用 AI 建议，Ctrl+P 跳过，输入 Q 退出并保存进度：")
-
-        # 读取用户输入，支持 Ctrl+P 跳过
-        try:
-            import msvcrt
-            import sys
+    md_contents: Dict[Path, str] = {}
+    md_dirty: Set[Path] = set()
+    # 每次审查开始时重新遍历一次，之后的查找都走内存索引
+    md_index = _get_filename_index(refresh=True)
+
+    # 每个标签只解析一次，循环中直接查表
+    label_files = {label: parse_label(label)[1] for label, _ in filtered_lines[start_index:]}
+    # 用户已跳过定位的文件名，后续同名条目不再重复询问
+    md_unresolved: Set[str] = set()
+
+    # 预先用同一份索引解析所有唯一文件名，并发读取能唯一定位的 Markdown 文件；
+    # 只有重名或找不到的文件才会在循环中交互询问
+    preload_paths = [
+        path
+        for path in (
+            resolve_md_path(name, POSTS_DIR, md_cache, md_index)
+            for name in set(label_files.values()) if name
+        )
+        if path
+    ]
+    preload_text_files(preload_paths, md_contents)
+
+    # 审查界面的静态提示在循环外只生成一次；标题与分隔线按宽度缓存
+    review_hint = _style("Enter 应用 AI 建议 | Ctrl+P 跳过不修改 | 输入新句子并回车确认 | Q 退出并保存进度", ANSI_GRAY)
+
+    next_index = start_index
+    unsaved = 0
+    last_md_path: Optional[Path] = None
+
+    def checkpoint() -> None:
+        nonlocal unsaved
+        # 先写回修改过的文件，再记录进度，保证进度不会超前于文件内容
+        for path in flush_text_cache(md_contents, md_dirty):
+            print(_style(f"⚠️ 写入文件失败: {path}", ANSI_RED))
+        save_review_progress(change_path_resolved, change_out_path_resolved, next_index)
+        unsaved = 0
+
+    def advance(new_index: int, md_path: Optional[Path]) -> None:
+        nonlocal next_index, unsaved, last_md_path
+        file_changed = last_md_path is not None and md_path != last_md_path
+        next_index = new_index
+        last_md_path = md_path
+        unsaved += 1
+        if file_changed or unsaved >= PROGRESS_SAVE_INTERVAL:
+            checkpoint()
 
-            sys.stdout.write("> ")
-            sys.stdout.flush()
+    failed_pairs: List[Tuple[str, str]] = []
+    try:
+        for idx in range(start_index, len(filtered_lines)):
+            label, sentence = filtered_lines[idx]
+
+            ai_info = change_out_data.get(label, {})
+            original_text = ai_info.get("original_text") or sentence
+            error_type = ai_info.get("error_type", "")
+            description = ai_info.get("description", "")
+            checked_text = ai_info.get("checked_text") or ai_info.get("raw", "")
+
+            # 1. 解析标签并定位文件
+            filename = label_files.get(label, "")
+            md_path = None
+            if filename and filename not in md_unresolved:
+                md_path = resolve_md_path_cli(filename, md_cache, md_index)
+                if md_path is None:
+                    md_unresolved.add(filename)
+
+            # 2. 预检查句子是否存在于文件中
+            exists = False
+            if md_path:
+                exists = check_sentence_in_file(md_path, sentence, md_contents)
+
+            # 3. 如果没找到，直接跳过并记录
+            if not exists:
+                change_line = f"{label}{sentence}"
+                raw_out = ai_info.get("raw") or ai_info.get("checked_text") or ""
+                out_line = f"{label}{raw_out}" if raw_out else label
+                failed_pairs.append((change_line, out_line))
+                advance(idx + 1, md_path)
+                continue
 
-            buffer = []
-            while True:
-                ch = msvcrt.getwch()
-
-                # Ctrl+P 跳过
-                if ch == '\x10':
-                    print("\n[已跳过]")
-                    save_review_progress(change_path, change_out_path, idx + 1)
-                    new_text = None
-                    break
-
-                # Enter 确认
-                elif ch == '\r':
-                    print()
-                    new_text = "".join(buffer)
-                    break
-
-                # Backspace
-                elif ch == '\x08':
-                    if buffer:
-                        sys.stdout.write('\b \b')
+            # 4. 只有存在时才让用户审查
+            # 终端宽度变化时取到新宽度对应的缓存结果，否则直接命中缓存
+            width = _term_width()
+            review_header = _format_header("模式 3：用户审查修改", width)
+            hr_line = _styled_hr(width)
+            frame = [
+                review_header,
+                _style(f"进度: {idx + 1}/{total_lines}", ANSI_GREEN), "\n",
+                review_hint, "\n\n",
+                hr_line, "\n",
+                f"文件: {md_path}\n",
+                hr_line, "\n",
+                f"原句: {original_text}\n",
+            ]
+            if error_type:
+                frame += [_style(f"错误类型: {error_type}", ANSI_YELLOW), "\n"]
+            if description:
+                frame += [_style(f"说明: {description}", ANSI_CYAN), "\n"]
+            frame += [
+                f"建议: {checked_text}\n",
+                hr_line, "\n",
+                "输入修改后的句子，直接回车应用 AI 建议，Ctrl+P 跳过，输入 Q 退出并保存进度：\n",
+            ]
+            _write_frame(frame)
+
+            # 读取用户输入，支持 Ctrl+P 跳过
+            if msvcrt is not None:
+                sys.stdout.write("> ")
+                sys.stdout.flush()
+
+                buffer = []
+                while True:
+                    ch = msvcrt.getwch()
+
+                    # Ctrl+P 跳过
+                    if ch == '\x10':
+                        print("\n[已跳过]")
+                        advance(idx + 1, md_path)
+                        new_text = None
+                        break
+
+                    # Enter 确认
+                    elif ch == '\r':
+                        print()
+                        new_text = "".join(buffer)
+                        break
+
+                    # Backspace
+                    elif ch == '\x08':
+                        if buffer:
+                            sys.stdout.write('\b \b')
+                            sys.stdout.flush()
+                            buffer.pop()
+
+                    # Ctrl+C 取消
+                    elif ch == '\x03':
+                        print("\n[已取消]")
+                        checkpoint()
+                        return
+
+                    else:
+                        sys.stdout.write(ch)
                         sys.stdout.flush()
-                        buffer.pop()
-
-                # Ctrl+C 取消
-                elif ch == '\x03':
-                    print("\n[已取消]")
-                    save_review_progress(change_path, change_out_path, idx)
-                    return
+                        buffer.append(ch)
 
-                else:
-                    sys.stdout.write(ch)
-                    sys.stdout.flush()
-                    buffer.append(ch)
-
-        except (ImportError, EOFError):
-            # 如果 msvcrt 不可用，回退到标准输入
-            try:
-                new_text = input("> ")
-            except EOFError:
-                new_text = ""
+            else:
+                # 如果 msvcrt 不可用，回退到标准输入
+                try:
+                    new_text = input("> ")
+                except EOFError:
+                    new_text = ""
 
-        # 如果按了 Ctrl+P 跳过，继续下一个
-        if new_text is None:
-            continue
+            # 如果按了 Ctrl+P 跳过，继续下一个
+            if new_text is None:
+                continue
 
-        # 检查是否退出
-        if new_text.strip().lower() == "q":
-            save_review_progress(change_path, change_out_path, idx)
-            print(_style("已保存进度，稍后可继续。", ANSI_YELLOW))
-            wait_for_key()
-            return
+            # 检查是否退出
+            if new_text.strip().lower() == "q":
+                checkpoint()
+                print(_style("已保存进度，稍后可继续。", ANSI_YELLOW))
+                wait_for_key()
+                return
 
-        new_text = new_text.strip()
+            new_text = new_text.strip()
 
-        # 如果什么都不输入直接回车，应用 AI 建议
-        if not new_text:
-            new_text = checked_text.strip()
+            # 如果什么都不输入直接回车，应用 AI 建议
             if not new_text:
-                save_review_progress(change_path, change_out_path, idx + 1)
-                continue
+                new_text = checked_text.strip()
+                if not new_text:
+                    advance(idx + 1, md_path)
+                    continue
 
-        if not replace_sentence_in_file(md_path, sentence, new_text):
-            # 虽然前面检查过存在，但由于多线程或磁盘延迟（极少数情况）可能失败
-            print("未找到可替换的句子，跳过该条。")
-            change_line = f"{label}{sentence}"
-            raw_out = ai_info.get("raw") or ai_info.get("checked_text") or ""
-            out_line = f"{label}{raw_out}" if raw_out else label
-            failed_pairs.append((change_line, out_line))
+            if not replace_sentence_in_file(md_path, sentence, new_text, md_contents, md_dirty):
+                # 虽然前面检查过存在，但由于多线程或磁盘延迟（极少数情况）可能失败
+                print("未找到可替换的句子，跳过该条。")
+                change_line = f"{label}{sentence}"
+                raw_out = ai_info.get("raw") or ai_info.get("checked_text") or ""
+                out_line = f"{label}{raw_out}" if raw_out else label
+                failed_pairs.append((change_line, out_line))
 
-        save_review_progress(change_path, change_out_path, idx + 1)
+            advance(idx + 1, md_path)
+    finally:
+        # 无论正常结束、退出还是异常，都写回剩余修改并记录进度
+        if unsaved or md_dirty:
+            checkpoint()
 
     print("\n✅ 审查完成")
     clear_review_progress()
@@ -554,16 +900,15 @@ def mode_review_changes() -> None:
 
 
 def get_multiline_input() -> str:
-    try:
-        import msvcrt
-    except ImportError:
+    if msvcrt is None:
         print("当前环境不支持特定按键输入 (msvcrt missing)")
         return input("由于环境限制，请使用单行输入: ")
 
-    print(_style(_hr(), ANSI_GRAY))
+    hr_line = _styled_hr(_term_width())
+    print(hr_line)
     print("多行输入模式")
     print("说明: Enter 换行 | Ctrl+S 保存并退出 | Esc 取消")
-    print(_style(_hr(), ANSI_GRAY))
+    print(hr_line)
 
     buffer = []
     sys.stdout.write("> ")
@@ -608,15 +953,16 @@ def get_multiline_input() -> str:
 
 
 def mode_config() -> None:
-    global POSTS_DIR
-    while True:
-        config = load_config()
-        if not config:
-            _render_header("配置选项")
-            print("无法加载配置文件 config.json")
-            wait_for_key()
-            return
+    global POSTS_DIR, _filename_index
+    # 只在进入时读取一次，保存后内存中的 config 已是最新内容
+    config = load_config()
+    if not config:
+        _render_header("配置选项")
+        print("无法加载配置文件 config.json")
+        wait_for_key()
+        return
 
+    while True:
         keys = list(config.keys())
         display_options = []
         for k in keys:
@@ -671,20 +1017,22 @@ def mode_config() -> None:
             if key == "POSTS_DIR":
                 # 重新加载逻辑
                 POSTS_DIR = get_posts_dir()
+                _filename_index = None
 
             wait_for_key()
 
 
 def mode_git_commit() -> None:
-    rc = run_script([
-        str(BASE_DIR / "git_commit.py"),
-    ])
+    rc = run_module("git_commit")
     if rc != 0:
         print("Git 提交失败")
         wait_for_key()
 
 
 def main() -> int:
+    _enable_vt_mode()
+    _watch_resize()
+
     if not POSTS_DIR.exists():
         clear_screen()
         _render_header("AI Markdown Checker")
@@ -713,13 +1061,17 @@ def main() -> int:
             break
         if choice == -2:
             removed = clear_output_cache(BASE_DIR)
+            invalidate_output_listing()
             print(f"已清除 output 缓存，共移除 {removed} 项。")
             wait_for_key()
             continue
         if choice == 0:
             mode_changed_files()
+            # 模式 1、2 会在 output 中生成新文件
+            invalidate_output_listing()
         elif choice == 1:
             mode_single_file()
+            invalidate_output_listing()
         elif choice == 2:
             mode_review_changes()
         elif choice == 3:
@@ -6,12 +6,26 @@ Git 差异提取工具
 提取工作目录相对于 HEAD 的所有新增和修改的代码行
 """
 
+import io
 import os
 import sys
 import argparse
+import itertools
+import re
 from pathlib import Path
 from datetime import datetime
 import subprocess
+import tempfile
+
+
+# 输出缓冲区达到该大小时写入一次文件
+WRITE_CHUNK_SIZE = 64 * 1024
+
+# Windows 下从 GUI 调用 git 时不弹出控制台窗口，其他平台为 0
+_CREATE_NO_WINDOW = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+# hunk 头，如 "@@ -12,5 +14,7 @@"，捕获新文件的起始行号
+_HUNK_RE = re.compile(r'@@ -\d+(?:,\d+)? \+(\d+)')
 
 
 class GitDiffExtractor:
@@ -38,7 +52,8 @@ class GitDiffExtractor:
                 capture_output=True,
                 encoding='utf-8',
                 errors='replace',
-                check=True
+                check=True,
+                creationflags=_CREATE_NO_WINDOW,
             )
             return result.stdout if result.stdout else ""
         except subprocess.CalledProcessError as e:
@@ -51,144 +66,190 @@ class GitDiffExtractor:
             print(f"执行 Git 命令时发生错误: {e}", file=sys.stderr)
             return ""
 
+    def _run_git_command_stream(self, *args):
+        """执行 Git 命令，逐行生成标准输出，不在内存中保留完整输出"""
+        # stderr 写入临时文件而不是管道：git 输出大量警告（如 autocrlf 的换行提示）时，
+        # 未读取的 stderr 管道写满会使 git 阻塞，而这里正阻塞在读取 stdout 上
+        with tempfile.TemporaryFile() as err_file:
+            try:
+                proc = subprocess.Popen(
+                    ["git", "-C", str(self.repo_path)] + list(args),
+                    stdout=subprocess.PIPE,
+                    stderr=err_file,
+                    encoding='utf-8',
+                    errors='replace',
+                    creationflags=_CREATE_NO_WINDOW,
+                )
+            except FileNotFoundError:
+                raise ValueError("未找到 Git 命令，请确保 Git 已安装并在 PATH 中")
+
+            with proc:
+                for line in proc.stdout:
+                    yield line[:-1] if line.endswith('\n') else line
+                proc.wait()
+
+            if proc.returncode != 0:
+                err_file.seek(0)
+                error_msg = err_file.read().decode('utf-8', errors='replace')
+                print(f"Git 命令执行失败: {error_msg or proc.returncode}", file=sys.stderr)
+
     def get_tracked_changes(self):
-        """获取已跟踪文件的变更"""
-        diff_output = self._run_git_command("diff", "HEAD")
+        """逐条生成已跟踪文件的变更"""
+        found = False
+        for change in self._parse_diff(self._run_git_command_stream("diff", "HEAD")):
+            found = True
+            yield change
 
-        if not diff_output:
+        if not found:
             print("提示: 没有检测到已跟踪文件的变更")
-            return []
-
-        return self._parse_diff(diff_output)
 
     def get_untracked_files(self):
-        """获取未跟踪的文件内容"""
+        """逐条生成未跟踪文件的内容"""
         untracked_output = self._run_git_command(
             "ls-files", "--others", "--exclude-standard"
         )
 
         if not untracked_output:
             print("提示: 没有检测到未跟踪的文件")
-            return []
+            return
 
         untracked_files = [f.strip()
                            for f in untracked_output.split('\n') if f.strip()]
 
-        changes = []
         for file_path in untracked_files:
             full_path = self.repo_path / file_path
             if full_path.is_file():
                 try:
-                    content = None
-                    for encoding in ['utf-8', 'gbk', 'latin-1']:
+                    # 只打开一次文件，在内存中依次尝试各种编码
+                    with open(full_path, 'rb') as f:
+                        raw = f.read()
+                    text = None
+                    for encoding in ['utf-8', 'gbk']:
                         try:
-                            with open(full_path, 'r', encoding=encoding) as f:
-                                content = f.readlines()
-                                break
+                            text = raw.decode(encoding)
+                            break
                         except UnicodeDecodeError:
                             continue
 
-                    if content is None:
-                        with open(full_path, 'rb') as f:
-                            content = f.read().decode('utf-8', errors='replace').split('\n')
-
-                    for line_num, line in enumerate(content, 1):
-                        changes.append({
-                            'file': file_path,
-                            'line_num': line_num,
-                            'content': line.rstrip('\n\r'),
-                            'type': 'new_file'
-                        })
+                    if text is None:
+                        # latin-1 可以解码任意字节，作为最后的回退
+                        text = raw.decode('latin-1')
+                    # 与文本模式读取一致，只按 \n、\r\n、\r 分行；str.splitlines 还会在
+                    # \f、\x85、\u2028 等字符处断开，导致之后的行号错位
+                    content = [line.rstrip('\n') for line in io.StringIO(text, newline=None)]
                 except Exception as e:
                     print(f"⚠️ 警告: 读取文件失败 {file_path}: {e}", file=sys.stderr)
-
-        return changes
-
-    def _parse_diff(self, diff_output):
-        """解析 diff 输出，提取新增和修改的行"""
-        if not diff_output:
-            return []
-
-        changes = []
+                    continue
+
+                for line_num, line in enumerate(content, 1):
+                    yield {
+                        'file': file_path,
+                        'line_num': line_num,
+                        'content': line,
+                        'type': 'new_file'
+                    }
+
+    def _parse_diff(self, lines):
+        """解析 diff 输出（逐行的可迭代对象），逐条生成新增和修改的行"""
         current_file = None
         line_num = 0
 
-        lines = diff_output.split('\n')
-
         for line in lines:
-            if line.startswith('diff --git'):
+            # 按首字符分派，绝大多数行只需一次比较
+            first = line[:1]
+            if first == '+':
+                if line[1:3] == '++':
+                    file_path = line[6:].strip()
+                    if file_path != '/dev/null' and file_path.startswith('b/'):
+                        current_file = file_path[2:]
+                    elif file_path != '/dev/null':
+                        current_file = file_path
+                elif current_file:
+                    yield {
+                        'file': current_file,
+                        'line_num': line_num,
+                        'content': line[1:],
+                        'type': 'added'
+                    }
+                    line_num += 1
+            elif first == '@' and line[1:2] == '@':
+                m = _HUNK_RE.match(line)
+                if m:
+                    line_num = int(m.group(1))
+            elif first == 'd' and line.startswith('diff --git'):
                 current_file = None
                 line_num = 0
-            elif line.startswith('+++'):
-                file_path = line[6:].strip()
-                if file_path != '/dev/null' and file_path.startswith('b/'):
-                    current_file = file_path[2:]
-                elif file_path != '/dev/null':
-                    current_file = file_path
-            elif line.startswith('@@'):
-                try:
-                    parts = line.split('@@')
-                    if len(parts) >= 2:
-                        range_info = parts[1].strip().split()
-                        for part in range_info:
-                            if part.startswith('+'):
-                                line_num = int(part.split(',')[0][1:])
-                                break
-                except Exception as e:
-                    print(f"⚠️ 警告: 解析行号失败: {e}", file=sys.stderr)
-                    line_num = 0
-            elif current_file and line.startswith('+') and not line.startswith('+++'):
-                content = line[1:]
-                changes.append({
-                    'file': current_file,
-                    'line_num': line_num,
-                    'content': content,
-                    'type': 'added'
-                })
+            elif first in ('-', '\\', ''):
+                # 删除行、"\ No newline" 提示和空行不占新文件的行号
+                continue
+            elif current_file and line_num > 0:
                 line_num += 1
-            elif current_file and line and not line.startswith('-') and not line.startswith('\\'):
-                if line_num > 0:
-                    line_num += 1
-
-        return changes
 
     def extract_all_changes(self):
-        """提取所有变更"""
+        """
+        提取所有变更
+
+        返回惰性迭代器，只有在 save_to_file 写入时才逐条生成，
+        不会把全部变更同时保存在内存中
+        """
         print("正在分析 Git 仓库变更...")
         print(f"仓库路径: {self.repo_path}")
 
-        tracked_changes = self.get_tracked_changes()
-        print(f"✅ 已跟踪文件变更: {len(tracked_changes)} 行")
-
-        untracked_changes = self.get_untracked_files()
-        print(f"✅ 未跟踪文件新增: {len(untracked_changes)} 行")
-
-        all_changes = tracked_changes + untracked_changes
-        return all_changes
+        return itertools.chain(self.get_tracked_changes(), self.get_untracked_files())
 
     def save_to_file(self, changes, output_file, include_metadata=True):
-        """保存变更到文件"""
+        """
+        保存变更到文件
+
+        Returns:
+            写入的变更行数；为 0 时不创建也不改动输出文件
+        """
         output_path = Path(output_file)
+        counts = {'added': 0, 'new_file': 0}
+        idx = 0
+        # 与文本模式写入保持一致的换行符
+        newline = os.linesep
 
+        # 先写临时文件，有变更时再原子替换：没有变更或中途出错时，已有的输出文件保持不变
+        tmp_path = output_path.with_name(output_path.name + ".tmp")
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
-                # 直接写入变更内容，不添加文件头
-                for idx, change in enumerate(changes, start=1):
+            with open(tmp_path, 'wb') as f:
+                # 先在内存中累积编码后的字节，攒够一块再写入，减少 write 调用
+                buf = bytearray()
+                for change in changes:
+                    idx += 1
+                    counts[change['type']] = counts.get(change['type'], 0) + 1
                     if include_metadata:
                         # 统一标签格式，便于后续审查流程解析
                         tag = f"@@S{idx:06d}|{change['file']}@@ "
-                        f.write(f"{tag}{change['content']}\n")
+                        buf += f"{tag}{change['content']}{newline}".encode('utf-8')
                     else:
                         # 只输出代码内容
-                        f.write(f"{change['content']}\n")
-
-            print(f"\n✅ 结果已保存到: {output_path.resolve()}")
-            print(f"✅ 共提取 {len(changes)} 行变更代码")
+                        buf += f"{change['content']}{newline}".encode('utf-8')
+                    if len(buf) >= WRITE_CHUNK_SIZE:
+                        f.write(buf)
+                        buf.clear()
+                if buf:
+                    f.write(buf)
+            if idx > 0:
+                os.replace(tmp_path, output_path)
         except Exception as e:
             raise ValueError(f"保存文件失败: {e}")
+        finally:
+            tmp_path.unlink(missing_ok=True)
+
+        print(f"✅ 已跟踪文件变更: {counts['added']} 行")
+        print(f"✅ 未跟踪文件新增: {counts['new_file']} 行")
+
+        if idx == 0:
+            return 0
 
+        print(f"\n✅ 结果已保存到: {output_path.resolve()}")
+        print(f"✅ 共提取 {idx} 行变更代码")
+        return idx
 
-def main():
+
+def main(argv=None):
     """主函数"""
     parser = argparse.ArgumentParser(
         description='提取 Git 仓库中工作目录相对于 HEAD 的所有新增和修改的代码行',
@@ -218,23 +279,22 @@ def main():
         help='不包含文件名和行号信息，只输出纯代码内容'
     )
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     try:
         extractor = GitDiffExtractor(args.repo_path)
         changes = extractor.extract_all_changes()
 
-        if not changes:
-            print("\n⚠️ 没有检测到任何变更！")
-            print("提示: 请确保工作目录有未提交的修改或新增文件")
-            return 0
-
-        extractor.save_to_file(
+        written = extractor.save_to_file(
             changes,
             args.output,
             include_metadata=not args.no_metadata
         )
 
+        if not written:
+            print("\n⚠️ 没有检测到任何变更！")
+            print("提示: 请确保工作目录有未提交的修改或新增文件")
+
         return 0
 
     except Exception as e:
@@ -11,17 +11,27 @@
 - 提供用户友好的进度条显示。
 - 通过命令行参数指定输入和输出文件，方便使用。
 - API 配置通过配置文件设置，无需设置环境变量。
-- 支持流式输出（streaming），更快的响应速度和更好的用户体验。
+- 默认一次性读取完整的结构化结果，可通过 STREAM_OUTPUT 开启流式输出。
+- 内容相同的行只请求一次，结果在本次运行中复用。
 """
 
 import sys
 import os
+import re
+import threading
 import time
 import json
+import functools
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 import ollama
 from tqdm import tqdm
 from pydantic import BaseModel
 
+from config_manager import json_loads
+from data_parser import split_label
+
 # --- 1. 配置区域 ---
 
 CONFIG_FILENAME = "config.json"
@@ -35,6 +45,43 @@ class CheckResult(BaseModel):
     checked_text: str
 
 
+class BatchResult(BaseModel):
+    """批量检查结果的数据模型，results 与输入行一一对应"""
+    results: list[CheckResult]
+
+
+# model_json_schema() 每次调用都会重新生成字典，只在加载时生成一次
+_CHECK_SCHEMA = CheckResult.model_json_schema()
+_BATCH_SCHEMA = BatchResult.model_json_schema()
+
+_NO_ERROR_HINT = "如果没有错误，error_type和description填写空字符串，checked_text与original_text保持一致。"
+_BATCH_HINT = (
+    "输入包含多行带编号的文本，请逐行独立检查，按编号顺序在 results 数组中返回每一行的结果，"
+    "数组长度必须与输入行数相同。"
+)
+
+
+# 提供给模型的示例输出，所有请求共用
+_JSON_EXAMPLES = (
+    "以下是一些示例输出：\n"
+    '{"original_text":"小明紧紧的抱住了妈妈。","error_type":"错别字","description":"“的/地”混淆，状语用“地”。","checked_text":"小明紧紧地抱住了妈妈。"}\n'
+    '{"original_text":"我跑的很快。","error_type":"错别字","description":"“的/得”混淆，补语用“得”。","checked_text":"我跑得很快。"}\n'
+    '{"original_text":"他己经完成了今天的任务。","error_type":"错别字","description":"“己/已”混淆。","checked_text":"他已经完成了今天的任务。"}\n'
+    '{"original_text":"他滥用手中的权利，为自己谋取私利。","error_type":"错别字","description":"“权力/权利”混淆。","checked_text":"他滥用手中的权力，为自己谋取私利。"}\n'
+    '{"original_text":"会议上，他一个大胆的建议。","error_type":"增删字","description":"缺少谓语“提出”。","checked_text":"会议上，他提出了一个大胆的建议。"}\n'
+    '{"original_text":"我们必须全面提升各项服务指标和水平。","error_type":"修辞错误","description":"“指标”和“水平”语义重复，用词冗余。","checked_text":"我们必须全面提升各项服务水平。"}\n'
+    '{"original_text":"这是一件可歌可泣的小事。","error_type":"用词不当","description":"“可歌可泣”褒贬不当，与“小事”不符。","checked_text":"这是一件令人感动的小事。"}\n'
+    '{"original_text":"他昨天买了一本新书在书店里。","error_type":"语序不当","description":"地点状语“在书店里”应置于动词“买”前。","checked_text":"他昨天在书店里买了一本新书。"}\n'
+    '{"original_text":"通过这次讨论，加强了对环保的认识。","error_type":"成分残缺","description":"缺少主语。","checked_text":"通过这次讨论，大家加强了对环保的认识。"}\n'
+    '{"original_text":"我们要牢牢把握住这次机会，积极争取。","error_type":"搭配不当","description":"“把握住”与“争取”搭配不当。","checked_text":"我们要牢牢把握住这次机会，积极争取成功。"}\n'
+    '{"original_text":"能否按期完成任务，关键在于质量。","error_type":"逻辑错误","description":"“能否”是两面性，后句不能只说一面。","checked_text":"能否按期完成任务，关键在于能否保证质量。"}\n'
+    '{"original_text":"傍晚时分，公园里传来阵阵欢声笑语。","error_type":"","description":"","checked_text":"傍晚时分，公园里传来阵阵欢声笑语。"}'
+)
+
+
+# 输出文件每累计写入这么多行刷新一次
+OUTPUT_FLUSH_LINES = 64
+
 REQUIRED_CONFIG_KEYS = [
     "SYSTEM_PROMPT",
     "OLLAMA_MODEL",
@@ -97,9 +144,76 @@ def initialize_client(config: dict):
 # --- 3. 核心处理函数 ---
 
 
+@functools.lru_cache(maxsize=8)
+def build_system_prompt(base_prompt: str, batch: bool = False) -> str:
+    """
+    拼接完整的系统提示词，相同的配置只拼接一次。
+
+    Args:
+        base_prompt: 配置中的 SYSTEM_PROMPT。
+        batch: 是否为批量请求追加说明。
+
+    Returns:
+        完整的系统提示词。
+    """
+    if batch:
+        return f"{base_prompt}\n\n{_NO_ERROR_HINT}\n{_BATCH_HINT}"
+    return f"{base_prompt}\n\n{_NO_ERROR_HINT}"
+
+
+@functools.lru_cache(maxsize=8)
+def build_prefix_messages(base_prompt: str, batch: bool = False) -> tuple:
+    """
+    生成所有请求共用的系统消息前缀。
+
+    前缀在每次请求中都逐字节相同且位于最前面，Ollama 才能复用这部分的
+    KV 缓存而无需重新计算；不要在它们之前插入或调换任何消息。
+
+    Returns:
+        (系统提示词消息, 示例消息) 元组。
+    """
+    return (
+        {"role": "system", "content": build_system_prompt(base_prompt, batch)},
+        {"role": "system", "content": _JSON_EXAMPLES},
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _estimate_prefix_tokens(base_prompt: str, batch: bool = False) -> int:
+    # 中文大多一个字不超过一个 token，按字符数估算即可保证覆盖整个前缀
+    return sum(len(message["content"]) for message in build_prefix_messages(base_prompt, batch))
+
+
+# 区分“配置中没有该字段”与字段值为 None
+_MISSING = object()
+
+
+@functools.lru_cache(maxsize=None)
+def build_options(temperature, top_p, num_keep: int) -> dict:
+    """
+    构建请求的 options 参数，相同的配置只构建一次，所有请求共用同一个字典。
+
+    Args:
+        temperature: 配置中的 temperature，未配置时为 _MISSING。
+        top_p: 配置中的 top_p，未配置时为 _MISSING。
+        num_keep: 上下文滑动时保留的前缀 token 数。
+
+    Returns:
+        传给 client.chat 的 options 字典，调用方不应修改。
+    """
+    options = {}
+    if temperature is not _MISSING:
+        options["temperature"] = temperature
+    if top_p is not _MISSING:
+        options["top_p"] = top_p
+    # 上下文滑动时保留固定前缀，避免重新计算
+    options["num_keep"] = num_keep
+    return options
+
+
 def get_ai_response(client: ollama.Client, content: str, config: dict) -> str:
     """
-    向 Ollama API 发送单次请求并获取结果（使用流式输出）。
+    向 Ollama API 发送单次请求并获取结果。
 
     Args:
         client: 已初始化的 Ollama 客户端实例。
@@ -112,56 +226,13 @@ def get_ai_response(client: ollama.Client, content: str, config: dict) -> str:
         return ""  # 如果行为空，则直接返回空字符串
 
     try:
-        # 构建系统提示词
-        system_prompt = (
-            f"{config['SYSTEM_PROMPT']}\n\n"
-            "如果没有错误，error_type和description填写空字符串，checked_text与original_text保持一致。"
-        )
-
-        json_examples = (
-            "以下是一些示例输出：\n"
-            '{"original_text":"小明紧紧的抱住了妈妈。","error_type":"错别字","description":"“的/地”混淆，状语用“地”。","checked_text":"小明紧紧地抱住了妈妈。"}\n'
-            '{"original_text":"我跑的很快。","error_type":"错别字","description":"“的/得”混淆，补语用“得”。","checked_text":"我跑得很快。"}\n'
-            '{"original_text":"他己经完成了今天的任务。","error_type":"错别字","description":"“己/已”混淆。","checked_text":"他已经完成了今天的任务。"}\n'
-            '{"original_text":"他滥用手中的权利，为自己谋取私利。","error_type":"错别字","description":"“权力/权利”混淆。","checked_text":"他滥用手中的权力，为自己谋取私利。"}\n'
-            '{"original_text":"会议上，他一个大胆的建议。","error_type":"增删字","description":"缺少谓语“提出”。","checked_text":"会议上，他提出了一个大胆的建议。"}\n'
-            '{"original_text":"我们必须全面提升各项服务指标和水平。","error_type":"修辞错误","description":"“指标”和“水平”语义重复，用词冗余。","checked_text":"我们必须全面提升各项服务水平。"}\n'
-            '{"original_text":"这是一件可歌可泣的小事。","error_type":"用词不当","description":"“可歌可泣”褒贬不当，与“小事”不符。","checked_text":"这是一件令人感动的小事。"}\n'
-            '{"original_text":"他昨天买了一本新书在书店里。","error_type":"语序不当","description":"地点状语“在书店里”应置于动词“买”前。","checked_text":"他昨天在书店里买了一本新书。"}\n'
-            '{"original_text":"通过这次讨论，加强了对环保的认识。","error_type":"成分残缺","description":"缺少主语。","checked_text":"通过这次讨论，大家加强了对环保的认识。"}\n'
-            '{"original_text":"我们要牢牢把握住这次机会，积极争取。","error_type":"搭配不当","description":"“把握住”与“争取”搭配不当。","checked_text":"我们要牢牢把握住这次机会，积极争取成功。"}\n'
-            '{"original_text":"能否按期完成任务，关键在于质量。","error_type":"逻辑错误","description":"“能否”是两面性，后句不能只说一面。","checked_text":"能否按期完成任务，关键在于能否保证质量。"}\n'
-            '{"original_text":"傍晚时分，公园里传来阵阵欢声笑语。","error_type":"","description":"","checked_text":"傍晚时分，公园里传来阵阵欢声笑语。"}'
-        )
-
-        # 构建 options 参数
-        options = {}
-        if "temperature" in config:
-            options["temperature"] = config["temperature"]
-        if "top_p" in config:
-            options["top_p"] = config["top_p"]
-
-        # 使用流式输出以获得更快的响应体验
-        stream = client.chat(
-            model=config["OLLAMA_MODEL"],
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "system", "content": json_examples},
-                {"role": "user", "content": content}
-            ],
-            format=CheckResult.model_json_schema(),  # 使用 Pydantic 模型的 JSON schema
-            options=options,
-            stream=True,  # 启用流式输出
-            think=False,  # 关闭 Ollama 思考
+        ai_result = chat_json(
+            client,
+            content,
+            _CHECK_SCHEMA,  # 使用 Pydantic 模型的 JSON schema
+            config,
         )
 
-        # 收集流式响应
-        ai_result = ""
-        for chunk in stream:
-            if chunk.get('message', {}).get('content'):
-                ai_result += chunk['message']['content']
-        ai_result = ai_result.strip()
-
         # 使用 Pydantic 模型验证 JSON 结果
         try:
             result = CheckResult.model_validate_json(ai_result)
@@ -177,14 +248,224 @@ def get_ai_response(client: ollama.Client, content: str, config: dict) -> str:
         return error_message
 
 
-def split_label(line: str) -> tuple[str, str]:
-    """从行中拆分 @@S000001|filename.md@@ 标签"""
-    if line.startswith("@@S"):
-        end = line.find("@@ ")
-        if end != -1:
-            label = line[: end + 3]
-            return label, line[end + 3:]
-    return "", line
+def chat_json(
+        client: ollama.Client,
+        user_content: str,
+        schema: dict,
+        config: dict,
+        batch: bool = False,
+) -> str:
+    """
+    发送一次结构化输出请求，返回模型生成的完整文本。
+
+    Args:
+        client: 已初始化的 Ollama 客户端实例。
+        user_content: 用户消息内容，位于共用的系统消息前缀之后。
+        schema: 约束输出格式的 JSON schema。
+        batch: 是否使用批量请求的系统提示词。
+
+    Returns:
+        去除首尾空白的模型输出。
+    """
+    prefix = build_prefix_messages(config['SYSTEM_PROMPT'], batch)
+    messages = [*prefix, {"role": "user", "content": user_content}]
+
+    # 构建 options 参数
+    if "num_keep" in config:
+        num_keep = config["num_keep"]
+    else:
+        num_keep = _estimate_prefix_tokens(config['SYSTEM_PROMPT'], batch)
+    options = build_options(
+        config.get("temperature", _MISSING),
+        config.get("top_p", _MISSING),
+        num_keep,
+    )
+
+    # 结构化输出只使用完整结果，默认关闭流式输出，一次读取整个响应
+    use_stream = bool(config.get("STREAM_OUTPUT", False))
+    response = client.chat(
+        model=config["OLLAMA_MODEL"],
+        messages=messages,
+        format=schema,
+        options=options,
+        stream=use_stream,
+        think=False,  # 关闭 Ollama 思考
+        keep_alive=config.get("KEEP_ALIVE", "30m"),  # 让模型常驻内存，前缀缓存不会随模型卸载而丢失
+    )
+
+    if not use_stream:
+        return (response['message']['content'] or "").strip()
+
+    # 收集流式响应
+    parts = []
+    for chunk in response:
+        content = chunk.get('message', {}).get('content')
+        if content:
+            parts.append(content)
+    return "".join(parts).strip()
+
+
+def get_ai_responses_batch(client: ollama.Client, contents: list[str], config: dict) -> list[str]:
+    """
+    把多行文本打包进一次请求，共享系统提示词和示例，摊薄每次请求的开销。
+
+    Args:
+        client: 已初始化的 Ollama 客户端实例。
+        contents: 要处理的多行文本，空行不会发送给模型。
+
+    Returns:
+        与 contents 一一对应的结果字符串列表。模型返回的条数不符时，
+        回退为逐行调用 get_ai_response。
+    """
+    results = [""] * len(contents)
+    pending = [i for i, content in enumerate(contents) if content]
+    if len(pending) <= 1:
+        for i in pending:
+            results[i] = get_ai_response(client, contents[i], config)
+        return results
+
+    user_content = "输入:\n" + "\n".join(
+        f"{n}) {contents[i]}" for n, i in enumerate(pending, start=1)
+    )
+
+    try:
+        ai_result = chat_json(
+            client,
+            user_content,
+            _BATCH_SCHEMA,
+            config,
+            batch=True,
+        )
+        batch = BatchResult.model_validate_json(ai_result)
+    except Exception as e:
+        log_line(f"\n⚠️ 警告: 批量请求失败，改为逐行处理: {str(e)[:100]}")
+        batch = None
+
+    if batch is None or len(batch.results) != len(pending):
+        if batch is not None:
+            log_line(f"\n⚠️ 警告: 批量结果条数不符（{len(batch.results)}/{len(pending)}），改为逐行处理")
+        for i in pending:
+            results[i] = get_ai_response(client, contents[i], config)
+        return results
+
+    for i, item in zip(pending, batch.results):
+        results[i] = item.model_dump_json(exclude_none=True)
+    return results
+
+
+def get_ai_responses_cached(
+    client: ollama.Client, contents: list[str], config: dict, cache: dict[str, str]
+) -> list[str]:
+    """
+    先按原文查找缓存，只把未命中的行交给 get_ai_responses_batch。
+
+    Args:
+        client: 已初始化的 Ollama 客户端实例。
+        contents: 要处理的多行文本。
+        cache: 原文到结果的缓存，命中的行不会再请求模型。
+
+    Returns:
+        与 contents 一一对应的结果字符串列表。API 错误不会写入缓存。
+    """
+    results = [cache.get(content) if content else "" for content in contents]
+    # 同一批次中重复的行也只请求一次
+    missing = list(dict.fromkeys(
+        content for content, result in zip(contents, results) if result is None
+    ))
+    if not missing:
+        return results
+
+    fresh = dict(zip(missing, get_ai_responses_batch(client, missing, config)))
+    for content, result in fresh.items():
+        if not result.startswith("API_ERROR:"):
+            cache[content] = result
+    return [
+        fresh[content] if result is None else result
+        for content, result in zip(contents, results)
+    ]
+
+
+def compile_prefilter(config: dict):
+    """
+    根据 PREFILTER_PATTERNS 配置编译本地预筛选规则。
+
+    Args:
+        config: 配置字典，PREFILTER_PATTERNS 为正则表达式字符串列表。
+
+    Returns:
+        合并后的正则对象；未配置时返回 None，所有行都发送给模型。
+    """
+    patterns = config.get("PREFILTER_PATTERNS") or []
+    if not patterns:
+        return None
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+def clean_result(content: str) -> str:
+    """为预筛选跳过的行构造无错误的检查结果。"""
+    return CheckResult(
+        original_text=content,
+        error_type="",
+        description="",
+        checked_text=content,
+    ).model_dump_json()
+
+
+def submit_batch(
+        pool: ThreadPoolExecutor,
+        client: ollama.Client,
+        contents: list[str],
+        config: dict,
+        cache: dict[str, str],
+        prefilter=None,
+) -> tuple[Future, bool]:
+    """
+    把一批内容提交到线程池处理。
+
+    Args:
+        pool: 发送请求的线程池。
+        client: 已初始化的 Ollama 客户端实例。
+        contents: 要处理的多行文本。
+        cache: 原文到结果的缓存。
+        prefilter: compile_prefilter 返回的预筛选规则，不匹配的行直接视为无错误。
+
+    Returns:
+        (future, 是否发出了请求)。整批为空行或命中缓存时不请求模型，
+        直接返回已完成的 future，调用方也无需等待请求间隔。
+    """
+    if prefilter is not None:
+        for content in contents:
+            if content and content not in cache and not prefilter.search(content):
+                cache[content] = clean_result(content)
+    if all(not content or content in cache for content in contents):
+        future = Future()
+        future.set_result([cache.get(content, "") if content else "" for content in contents])
+        return future, False
+    return pool.submit(get_ai_responses_cached, client, contents, config, cache), True
+
+
+def count_lines(path: str) -> int:
+    """
+    以二进制分块统计文件行数，不需要解码或保留文件内容。
+
+    Args:
+        path: 文件路径。
+
+    Returns:
+        行数，最后一行没有换行符时同样计入。
+    """
+    count = 0
+    last = b"\n"
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(1 << 20)
+            if not chunk:
+                break
+            count += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        count += 1
+    return count
 
 
 def log_line(message: str) -> None:
@@ -193,7 +474,15 @@ def log_line(message: str) -> None:
 
 
 class PauseController:
-    """通过非阻塞键检查处理暂停/恢复/停止输入"""
+    """
+    在后台线程中检查按键，处理暂停/恢复/停止输入。
+
+    主循环只读取 paused/stop 两个标志，不再每行调用 kbhit()。
+    使用完毕后需调用 close()，以免后台线程在脚本结束后继续读取按键。
+    """
+
+    # 后台线程两次检查按键之间的间隔（秒）
+    POLL_INTERVAL = 0.05
 
     def __init__(self) -> None:
         try:
@@ -205,10 +494,24 @@ class PauseController:
 
         self.paused = False
         self.stop = False
-
-    def poll(self) -> None:
-        if not self._msvcrt:
-            return
+        self._closed = threading.Event()
+        self._thread = None
+        if self._msvcrt:
+            self._thread = threading.Thread(target=self._reader_loop, daemon=True)
+            self._thread.start()
+
+    def _reader_loop(self) -> None:
+        # 用 kbhit() 轮询而不是阻塞在 getch()，这样 close() 后线程可以及时退出
+        while not self._closed.wait(self.POLL_INTERVAL):
+            self._poll()
+
+    def close(self) -> None:
+        self._closed.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _poll(self) -> None:
         while self._msvcrt.kbhit():
             ch = self._msvcrt.getch()
             if ch in (b"p", b"P"):
@@ -222,19 +525,19 @@ class PauseController:
     def wait_if_paused(self) -> None:
         while self.paused and not self.stop:
             time.sleep(0.2)
-            self.poll()
 
 # --- 4. 主执行逻辑 ---
 
 
-def main():
+def main(argv=None):
     """脚本主入口函数。"""
-    if len(sys.argv) != 3:
+    args = sys.argv[1:] if argv is None else argv
+    if len(args) != 2:
         print("❌ 错误：参数数量不正确。")
         print("📚 用法: python ai_process.py <输入文件路径> <输出文件路径>")
         sys.exit(1)
 
-    input_filepath, output_filepath = sys.argv[1], sys.argv[2]
+    input_filepath, output_filepath = args[0], args[1]
 
     if not os.path.exists(input_filepath):
         print(f"❌ 错误：输入文件 '{input_filepath}' 不存在。")
@@ -250,54 +553,107 @@ def main():
         print(f"🦙 Ollama 地址: {config['OLLAMA_HOST']}")
     print("-" * 50)
 
+    # 只预先统计行数，处理时逐行读取，不把整个文件载入内存
     try:
-        with open(input_filepath, 'r', encoding='utf-8') as f_in:
-            lines_to_process = f_in.readlines()
+        total_lines = count_lines(input_filepath)
+        f_in = open(input_filepath, 'r', encoding='utf-8')
     except Exception as e:
         print(f"❌ 错误：读取输入文件 '{input_filepath}' 失败。")
         print(f"🔎 详细错误: {e}")
         sys.exit(1)
 
-    print(f"准备处理文件 '{input_filepath}' 中的 {len(lines_to_process)} 行内容...")
+    print(f"准备处理文件 '{input_filepath}' 中的 {total_lines} 行内容...")
+
+    # 每次请求打包的行数，为 1 时逐行请求
+    batch_size = max(1, int(config.get("BATCH_SIZE", 1)))
+    # 同时在途的请求数，Ollama 服务端可以把并发请求合并进同一次推理
+    num_parallel = max(1, int(config.get("OLLAMA_NUM_PARALLEL", 1)))
+    # 请求间隔在循环外解析一次
+    delay = float(config["REQUEST_DELAY_SECONDS"])
+    # 原文 -> 结果，分句后重复出现的句子不再请求模型
+    response_cache: dict[str, str] = {}
+    # 本地预筛选：不含任何可疑模式的行直接视为无错误，不请求模型
+    prefilter = compile_prefilter(config)
+
+    def write_batch(f_out, batch, ai_results) -> int:
+        written = 0
+        for (label, _), ai_result in zip(batch, ai_results):
+            # 解析 JSON 结果，判断是否有错误
+            try:
+                # 已安装 orjson 时使用其 C 实现解析；解析失败同样抛出 json.JSONDecodeError 的子类
+                result_json = json_loads(ai_result)
+                # 如果 error_type 为空或没有错误，则跳过不写入
+                if not result_json.get("error_type") or result_json.get("error_type").strip() == "":
+                    continue
+            except json.JSONDecodeError:
+                # 如果无法解析 JSON，仍然写入原始结果
+                log_line(f"\n⚠️ 无法解析 JSON 结果，写入原始内容: {ai_result[:50]}")
+
+            f_out.write(f"{label}{ai_result}\n")
+            written += 1
+        return written
 
     pause_controller = PauseController()
     log_line("提示：按 P 键可暂停/继续，按 Q 键可终止处理。")
 
     try:
-        with open(output_filepath, 'w', encoding='utf-8') as f_out:
-            for line in tqdm(lines_to_process, desc="AI 处理进度", unit=" 行", ncols=100):
-                pause_controller.poll()
-                if pause_controller.stop:
+        # 使用较大的写缓冲区，每写入 OUTPUT_FLUSH_LINES 行或暂停时才刷新一次；
+        # 文件在 with 结束（包括异常和中断）时关闭并写入剩余内容
+        with f_in, \
+                open(output_filepath, 'w', encoding='utf-8', buffering=1 << 16) as f_out, \
+                tqdm(total=total_lines, desc="AI 处理进度", unit=" 行", ncols=100) as progress, \
+                ThreadPoolExecutor(max_workers=num_parallel) as pool:
+            # 按提交顺序排队的 (批次, future)，保证输出顺序与输入一致
+            in_flight = deque()
+            exhausted = False
+            unflushed = 0
+            while True:
+                # 补满在途请求，暂停或终止时不再提交新的请求
+                while not exhausted and len(in_flight) < num_parallel:
+                    if in_flight and pause_controller.paused:
+                        break
+                    if pause_controller.paused and unflushed:
+                        # 暂停期间让已有结果落盘
+                        f_out.flush()
+                        unflushed = 0
+                    pause_controller.wait_if_paused()
+                    if pause_controller.stop:
+                        exhausted = True
+                        break
+
+                    batch = [
+                        split_label(line.strip())
+                        for line in islice(f_in, batch_size)
+                    ]
+                    if not batch:
+                        exhausted = True
+                        break
+                    future, requested = submit_batch(
+                        pool, client, [content for _, content in batch],
+                        config, response_cache, prefilter,
+                    )
+                    in_flight.append((batch, future))
+
+                    # 整批命中缓存时没有发出请求，无需等待请求间隔
+                    if requested:
+                        time.sleep(delay)
+
+                if not in_flight:
                     break
 
-                pause_controller.wait_if_paused()
-                if pause_controller.stop:
-                    break
-
-                content_to_process = line.strip()
-                label, content_to_process = split_label(content_to_process)
-
-                ai_result = get_ai_response(client, content_to_process, config)
-
-                # 解析 JSON 结果，判断是否有错误
-                try:
-                    result_json = json.loads(ai_result)
-                    # 如果 error_type 为空或没有错误，则跳过不写入
-                    if not result_json.get("error_type") or result_json.get("error_type").strip() == "":
-                        time.sleep(config["REQUEST_DELAY_SECONDS"])
-                        continue
-                except json.JSONDecodeError:
-                    # 如果无法解析 JSON，仍然写入原始结果
-                    log_line(f"\n⚠️ 无法解析 JSON 结果，写入原始内容: {ai_result[:50]}")
-
-                f_out.write(f"{label}{ai_result}\n")
-                f_out.flush()  # 实时将结果写入磁盘，防止程序意外中断时丢失数据
-
-                time.sleep(config["REQUEST_DELAY_SECONDS"])
+                # 已发出的请求即使在终止后也会完成并写入
+                batch, future = in_flight.popleft()
+                unflushed += write_batch(f_out, batch, future.result())
+                if unflushed >= OUTPUT_FLUSH_LINES:
+                    f_out.flush()
+                    unflushed = 0
+                progress.update(len(batch))
     except Exception as e:
         print(f"\n❌ 错误：在写入输出文件 '{output_filepath}' 时发生严重错误，处理已中断。")
         print(f"🔎 详细错误: {e}")
         sys.exit(1)
+    finally:
+        pause_controller.close()
 
     print("-" * 50)
     if pause_controller.stop:
@@ -10,21 +10,199 @@
 -只提取段落、列表、引用中的文本。
 - 将提取的内容按句子（以'。'、'！'、'？'结尾，包括与括号的组合）分割。
 - 将结果以每句一行的形式输出到文本文件。
+- 通过 --batch 指定目录时，使用多个进程并行处理目录中的所有 Markdown 文件。
 """
 
 import argparse
+import bisect
+import functools
+import hashlib
+import json
 import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Optional
+
+from file_manager import ensure_output_dir, list_markdown_files, make_output_stem
+
+
+# 文件开头的空白字符，用于定位 Front Matter 的起始位置而不复制文件内容
+_LEADING_WS_RE = re.compile(r'\s*')
+# 反斜杠后跟 ASCII 标点符号的转义序列
+_ESCAPE_RE = re.compile(r'\\([!"#$%&\'()*+,-./:;<=>?@\[\\\]^_`{|}~])')
+# 句末标点，支持标点与右括号、引号的组合
+_SENTENCE_END_RE = re.compile(
+    r'(?:[。！？.!?]+[）”’」』"\'\)\]\}]+|[）”’」』"\'\)\]\}]+[。！？.!?]+|[。！？.!?]+)'
+)
+# 纯 ASCII 行使用的等价模式，字符集更小
+_SENTENCE_END_ASCII_RE = re.compile(
+    r'(?:[.!?]+["\'\)\]\}]+|["\'\)\]\}]+[.!?]+|[.!?]+)'
+)
+# 可能跨行的公式块 $$...$$；不跨越 NUL，所有文本块以 NUL 拼接后一次替换时，公式不会跨块匹配
+_DISPLAY_MATH_RE = re.compile(r'\$\$[^\0]+?\$\$')
+
+# 内联 token 的处理方式；同类 token 共用一个动作码，表中没有的 token 直接忽略
+(
+    _INLINE_CONTENT,     # 原样保留内容
+    _INLINE_CODE,        # 行内代码，保留反引号
+    _INLINE_MARKUP,      # 原样保留标记符号的内联样式
+    _INLINE_BREAK,       # 换行
+    _INLINE_LINK_OPEN,
+    _INLINE_LINK_CLOSE,
+    _INLINE_IMAGE,
+) = range(7)
+
+_INLINE_ACTIONS = {
+    "text": _INLINE_CONTENT,
+    "html_inline": _INLINE_CONTENT,
+    "code_inline": _INLINE_CODE,
+    "strong_open": _INLINE_MARKUP,
+    "strong_close": _INLINE_MARKUP,
+    "em_open": _INLINE_MARKUP,
+    "em_close": _INLINE_MARKUP,
+    "softbreak": _INLINE_BREAK,
+    "hardbreak": _INLINE_BREAK,
+    "link_open": _INLINE_LINK_OPEN,
+    "link_close": _INLINE_LINK_CLOSE,
+    "image": _INLINE_IMAGE,
+}
+
+# 需要跟踪的块级 token 及其类别；表格的行、单元格等 token 总是位于 table_open/table_close 之间，
+# 只跟踪表格本身即可完全过滤表格内容
+_BLOCK_KINDS = {
+    "paragraph": "paragraph",
+    "list_item": "list_item",
+    "heading": "heading",
+    "blockquote": "blockquote",
+    "table": "table",
+}
+# token 类型 -> (类别, 深度变化)；不在其中的开闭 token 不影响是否提取文本，直接跳过
+_BLOCK_DEPTH_CHANGES = {
+    **{f"{name}_open": (kind, 1) for name, kind in _BLOCK_KINDS.items()},
+    **{f"{name}_close": (kind, -1) for name, kind in _BLOCK_KINDS.items()},
+}
+
+
+# 提取结果的磁盘缓存，位于 output 目录下，清除输出缓存时一并删除
+BLOCKS_CACHE_DIRNAME = ".cache"
+# 提取规则变化时递增，使旧的缓存全部失效
+BLOCKS_CACHE_VERSION = b"1"
+# 缓存文件数量上限，超出时删除最久未使用的条目
+BLOCKS_CACHE_MAX_ENTRIES = 4096
+# 超过该时间（秒）的临时文件视为进程崩溃遗留，清理时一并删除
+BLOCKS_CACHE_TMP_MAX_AGE = 3600
+
+# 每个进程只清理一次缓存目录，批量处理时不必每写入一个文件就遍历整个目录
+_blocks_cache_pruned = False
+
+
+def _blocks_cache_key(raw: bytes) -> str:
+    return hashlib.blake2b(raw, digest_size=16, person=BLOCKS_CACHE_VERSION).hexdigest()
+
+
+def _blocks_cache_path(key: str) -> Path:
+    return ensure_output_dir() / BLOCKS_CACHE_DIRNAME / f"{key}.blocks.json"
+
+
+def load_cached_blocks(key: str) -> Optional[list[str]]:
+    """
+    读取缓存的文本块，命中时更新文件时间，供淘汰最久未使用的条目。
+
+    Args:
+        key (str): 文件内容的哈希。
+
+    Returns:
+        Optional[list[str]]: 缓存的文本块列表，未命中或缓存损坏时返回 None。
+    """
+    path = _blocks_cache_path(key)
+    try:
+        with open(path, 'rb') as f:
+            blocks = json.loads(f.read())
+    except (OSError, ValueError):
+        return None
+    # 缓存被损坏或手工修改时，元素不一定都是字符串
+    if not isinstance(blocks, list) or not all(isinstance(block, str) for block in blocks):
+        return None
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return blocks
+
+
+def store_cached_blocks(key: str, blocks: list[str]) -> None:
+    """
+    写入文本块缓存；写入失败不影响处理结果。
 
-try:
-    from markdown_it import MarkdownIt
-except ImportError as exc:
-    print("❌ 错误: 无法导入模块 'markdown_it'。", file=sys.stderr)
-    print(f"   详情: {exc}", file=sys.stderr)
-    print("   请使用当前解释器安装:", file=sys.stderr)
-    print(f"   {sys.executable} -m pip install markdown-it-py", file=sys.stderr)
-    sys.exit(1)
+    先写临时文件再替换，批量模式下多个进程同时写入也不会读到不完整的文件。
+
+    Args:
+        key (str): 文件内容的哈希。
+        blocks (list[str]): 提取出的文本块列表。
+    """
+    path = _blocks_cache_path(key)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(blocks, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        global _blocks_cache_pruned
+        if not _blocks_cache_pruned:
+            _blocks_cache_pruned = True
+            _prune_blocks_cache(path.parent)
+    except OSError:
+        pass
+
+
+def _prune_blocks_cache(cache_dir: Path) -> None:
+    entries = []
+    stale_before = time.time() - BLOCKS_CACHE_TMP_MAX_AGE
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".blocks.json"):
+                entries.append(entry)
+            elif entry.name.endswith(".tmp"):
+                # 只删除较旧的临时文件，其他进程正在写入的不受影响
+                try:
+                    if entry.stat().st_mtime < stale_before:
+                        os.unlink(entry.path)
+                except OSError:
+                    pass
+    if len(entries) <= BLOCKS_CACHE_MAX_ENTRIES:
+        return
+    # 按最近使用时间淘汰，保留最新的 BLOCKS_CACHE_MAX_ENTRIES 条
+    entries.sort(key=lambda entry: entry.stat().st_mtime_ns)
+    for entry in entries[:len(entries) - BLOCKS_CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+@functools.lru_cache(maxsize=None)
+def get_markdown_parser():
+    """
+    延迟导入 markdown_it 并构建解析器，只在第一次解析时执行一次。
+
+    这样 --help、参数错误以及只使用 split_into_sentences 的调用方都无需加载解析器。
+
+    Returns:
+        启用了表格支持的 MarkdownIt 实例，可在多个文件之间复用。
+    """
+    try:
+        from markdown_it import MarkdownIt
+    except ImportError as exc:
+        print("❌ 错误: 无法导入模块 'markdown_it'。", file=sys.stderr)
+        print(f"   详情: {exc}", file=sys.stderr)
+        print("   请使用当前解释器安装:", file=sys.stderr)
+        print(f"   {sys.executable} -m pip install markdown-it-py", file=sys.stderr)
+        sys.exit(1)
+    # 启用表格支持，以便正确识别和过滤表格内容
+    return MarkdownIt().enable('table')
 
 
 def extract_text_from_markdown(file_path: str) -> list[str]:
@@ -45,8 +223,10 @@ def extract_text_from_markdown(file_path: str) -> list[str]:
     """
     print(f"📄 正在读取和解析输入文件: {file_path}")
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            raw = f.read()
+        # 与文本模式读取相同：按 UTF-8 解码并统一换行符
+        content = raw.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
     except FileNotFoundError:
         print(f"❌ 错误: 输入文件未找到 -> {file_path}", file=sys.stderr)
         sys.exit(1)
@@ -54,11 +234,21 @@ def extract_text_from_markdown(file_path: str) -> list[str]:
         print(f"❌ 错误: 读取文件时发生未知错误 -> {e}", file=sys.stderr)
         sys.exit(1)
 
+    # 内容未变化的文件直接使用上次的提取结果，跳过解析
+    cache_key = _blocks_cache_key(raw)
+    cached = load_cached_blocks(cache_key)
+    if cached is not None:
+        print(f"  - 文件内容未变化，使用缓存的 {len(cached)} 个段落/列表项/引用。")
+        return cached
+
     # 1. 移除 Front Matter
-    parts = content.split('---', 2)
-    if len(parts) == 3 and parts[0].strip() == '':
+    # 开头（允许前置空白）为 ---，且之后还有一个 --- 时，第二个 --- 之后为正文；
+    # 按位置查找后只切片一次，没有 Front Matter 的文件不会被复制
+    start = _LEADING_WS_RE.match(content).end()
+    end = content.find('---', start + 3) if content.startswith('---', start) else -1
+    if end != -1:
         print("  - 检测到 Front Matter，已自动忽略。")
-        markdown_body = parts[2]
+        markdown_body = content[end + 3:]
     else:
         print("  - 未检测到 Front Matter，将处理整个文件。")
         markdown_body = content
@@ -67,50 +257,49 @@ def extract_text_from_markdown(file_path: str) -> list[str]:
     # 使用 \uE000 作为占位符，匹配反斜杠后跟着 ASCII 标点符号的情况
     # 这样 markdown-it 看到的是 "\uE000" + "\X"，它会将 \X 处理为转义字符（只保留 X），
     # 最终我们得到 "\uE000" + "X"，再将其替换回 "\X"
-    markdown_body = re.sub(
-        r'\\([!"#$%&\'()*+,-./:;<=>?@\[\\\]^_`{|}~])', '\uE000' + r'\\\1', markdown_body)
+    # 不含反斜杠的文件（大多数文章）跳过正则替换，也无需在最后还原占位符
+    escape_count = 0
+    if '\\' in markdown_body:
+        markdown_body, escape_count = _ESCAPE_RE.subn('\uE000' + r'\\\1', markdown_body)
 
     # 3. 使用 markdown-it-py 解析
     print("  - 正在使用 AST 解析 Markdown 结构...")
-    # 启用表格支持，以便正确识别和过滤表格内容
-    md = MarkdownIt().enable('table')
-    tokens = md.parse(markdown_body)
+    tokens = get_markdown_parser().parse(markdown_body)
 
     # 4. 提取目标文本
     text_blocks = []
     # 只关心段落与列表项内的文本
     # 'inline' token 包含了该块的实际文本内容
 
-    stack = []
-
     def _extract_inline_text(inline_token):
         # Rebuild text from inline children, preserving markdown inline styles.
-        if not inline_token.children:
-            return inline_token.content.replace('\uE000', '\\')
+        children = inline_token.children
+        if not children:
+            return inline_token.content
+        # 纯文本段落（最常见的情况）直接拼接，无需逐个分派
+        if all(child.type == "text" for child in children):
+            return "".join(child.content for child in children)
         parts = []
         link_stack = []  # 用于处理链接 [text](url)
 
-        for child in inline_token.children:
-            if child.type == "image":
-                if link_stack:
-                    link_stack[-1]["has_image"] = True
+        for child in children:
+            # 一次查表得到动作码，未知类型无需逐个比较
+            action = _INLINE_ACTIONS.get(child.type)
+            if action is None:
                 continue
-            elif child.type == "text":
+            if action == _INLINE_CONTENT:
                 parts.append(child.content)
-            elif child.type == "html_inline":
-                parts.append(child.content)
-            elif child.type == "code_inline":
+            elif action == _INLINE_MARKUP:
+                parts.append(child.markup)
+            elif action == _INLINE_CODE:
                 # 保留行内代码的反引号
                 parts.append(f"`{child.content}`")
-            elif child.type == "strong_open":
-                parts.append(child.markup)
-            elif child.type == "strong_close":
-                parts.append(child.markup)
-            elif child.type == "em_open":
-                parts.append(child.markup)
-            elif child.type == "em_close":
-                parts.append(child.markup)
-            elif child.type == "link_open":
+            elif action == _INLINE_BREAK:
+                parts.append("\n")
+            elif action == _INLINE_IMAGE:
+                if link_stack:
+                    link_stack[-1]["has_image"] = True
+            elif action == _INLINE_LINK_OPEN:
                 # 记录链接开始在 parts 列表中的索引
                 href = child.attrGet("href") or ""
                 link_stack.append({
@@ -119,7 +308,7 @@ def extract_text_from_markdown(file_path: str) -> list[str]:
                     "has_image": False
                 })
                 parts.append("[")
-            elif child.type == "link_close":
+            else:  # _INLINE_LINK_CLOSE
                 if link_stack:
                     link_info = link_stack.pop()
                     if link_info.get("has_image"):
@@ -130,39 +319,35 @@ def extract_text_from_markdown(file_path: str) -> list[str]:
                         parts.append(f"({link_info['href']})")
                 else:
                     parts.append("]")
-            elif child.type in ("softbreak", "hardbreak"):
-                parts.append("\n")
-        return "".join(parts).replace('\uE000', '\\')
+        return "".join(parts)
 
-    for token in tokens:
-        if token.nesting == 1:
-            stack.append(token.type)
-            continue
-        if token.nesting == -1:
-            if stack:
-                stack.pop()
-            continue
+    # 各类块的嵌套深度，开闭 token 时增减，判断时无需扫描整个栈
+    depth = {kind: 0 for kind in set(_BLOCK_KINDS.values())}
 
+    for token in tokens:
         if token.type != "inline":
+            change = _BLOCK_DEPTH_CHANGES.get(token.type)
+            if change:
+                kind, delta = change
+                depth[kind] += delta
             continue
 
-        inline_text = _extract_inline_text(token).strip()
-        if not inline_text:
+        # 包含块引用内容；先判断所在的块，不需要的块不提取文本
+        if not (depth["paragraph"] or depth["list_item"] or depth["blockquote"]):
+            continue
+        if depth["heading"] or depth["table"]:
             continue
 
-        in_paragraph = "paragraph_open" in stack
-        in_list_item = "list_item_open" in stack
-        in_heading = "heading_open" in stack
-        # 检查所有表格相关的 token，确保完全过滤表格内容
-        table_tokens = {"table_open", "thead_open",
-                        "tbody_open", "tr_open", "th_open", "td_open"}
-        in_table = any(t in table_tokens for t in stack)
-        in_blockquote = "blockquote_open" in stack
-
-        # 包含块引用内容
-        if (in_paragraph or in_list_item or in_blockquote) and not in_heading and not in_table:
+        inline_text = _extract_inline_text(token).strip()
+        if inline_text:
             text_blocks.append(inline_text)
 
+    # 占位符统一在最后一次性还原：markdown-it 会把 NUL 替换为 U+FFFD，
+    # 因此 "\0" 不会出现在提取结果中，可安全用作拼接分隔符
+    if escape_count and text_blocks:
+        text_blocks = "\0".join(text_blocks).replace('\uE000', '\\').split("\0")
+
+    store_cached_blocks(cache_key, text_blocks)
     print(f"  - 成功从 {len(text_blocks)} 个段落/列表项/引用中提取文本。")
     return text_blocks
 
@@ -185,11 +370,6 @@ def split_into_sentences(text_blocks: list[str]) -> list[str]:
     """
     print("正在进行句子分割...")
 
-    # 句末标点的正则表达式
-    sentence_end_pattern = re.compile(
-        r'(?:[。！？.!?]+[）”’」』"\'\)\]\}]+|[）”’」』"\'\)\]\}]+[。！？.!?]+|[。！？.!?]+)'
-    )
-
     def find_inline_style_ranges(text: str) -> list[tuple[int, int, str]]:
         """
         查找文本中所有 Markdown 内联样式的区间。
@@ -199,6 +379,10 @@ def split_into_sentences(text_blocks: list[str]) -> list[str]:
         """
         ranges = []
 
+        # 绝大多数文本不含任何样式标记，直接返回
+        if '*' not in text and '_' not in text and '~' not in text:
+            return ranges
+
         # Markdown 内联样式标记，按长度从长到短排序，避免匹配冲突
         # 格式: (marker, is_symmetric)
         markers = [
@@ -224,9 +408,9 @@ def split_into_sentences(text_blocks: list[str]) -> list[str]:
                 end = text.find(marker, end_search_start)
 
                 if end == -1:
-                    # 没有找到结束标记，跳过此开始标记
-                    pos = start + 1
-                    continue
+                    # 开始标记之后再没有同样的标记，后面的位置也不可能配对，
+                    # 直接结束，避免对每个剩余标记重复扫描到文本末尾
+                    break
 
                 # 记录区间 [start, end + marker_len)
                 ranges.append((start, end + marker_len, marker))
@@ -236,19 +420,44 @@ def split_into_sentences(text_blocks: list[str]) -> list[str]:
         ranges.sort(key=lambda x: x[0])
         return ranges
 
-    def is_inside_style(pos: int, style_ranges: list[tuple[int, int, str]]) -> tuple[bool, int]:
+    def build_style_index(style_ranges: list[tuple[int, int, str]]) -> tuple[list[int], list[int]]:
         """
-        检查位置 pos 是否在某个样式区间内。
+        为已按开始位置排序的样式区间建立二分查找索引。
 
         Returns:
-            (is_inside, style_end): 如果在样式内，返回(True, 样式结束位置)，否则(False, pos)
+            (starts, max_ends): 各区间的开始位置，以及截至每个区间为止的最大结束位置
         """
+        starts = []
+        max_ends = []
+        max_end = -1
         for start, end, marker in style_ranges:
-            if start < pos < end:
-                return True, end
+            starts.append(start)
+            max_end = max(max_end, end)
+            max_ends.append(max_end)
+        return starts, max_ends
+
+    def is_inside_style(pos: int, style_index: tuple[list[int], list[int]]) -> tuple[bool, int]:
+        """
+        检查位置 pos 是否在某个样式区间内，二分查找，复杂度 O(log R)。
+
+        Returns:
+            (is_inside, style_end): 如果在样式内，返回(True, 样式结束位置)，否则(False, pos)
+        """
+        starts, max_ends = style_index
+        # 只有开始位置小于 pos 的区间才可能包含 pos
+        count = bisect.bisect_left(starts, pos)
+        # 第一个结束位置超过 pos 的区间即为包含 pos 的最靠前的区间
+        i = bisect.bisect_right(max_ends, pos, 0, count)
+        if i < count:
+            return True, max_ends[i]
         return False, pos
 
-    def find_sentence_boundary(text: str, start_pos: int, style_ranges: list[tuple[int, int, str]]) -> int:
+    def find_sentence_boundary(
+            text: str,
+            start_pos: int,
+            style_index: tuple[list[int], list[int]],
+            sentence_end_re: re.Pattern = _SENTENCE_END_RE,
+    ) -> int:
         """
         从 start_pos 开始查找下一个句子的结束位置。
         考虑句末标点和 Markdown 内联样式，以较长的边界为准。
@@ -256,19 +465,19 @@ def split_into_sentences(text_blocks: list[str]) -> list[str]:
         Returns:
             句子结束位置的索引（不包含该位置）。
         """
-        search_text = text[start_pos:]
-        match = sentence_end_pattern.search(search_text)
+        # 直接从 start_pos 开始匹配，不再切片复制剩余文本
+        match = sentence_end_re.search(text, start_pos)
 
         if not match:
             # 没有找到句末标点，返回文本结束位置
             return len(text)
 
         # 句末标点的绝对结束位置
-        punctuation_end = start_pos + match.end()
+        punctuation_end = match.end()
 
         # 检查标点位置是否在某个内联样式中
         is_inside, style_end = is_inside_style(
-            punctuation_end - 1, style_ranges)
+            punctuation_end - 1, style_index)
 
         if is_inside:
             # 在样式内，使用样式结束位置
@@ -279,37 +488,56 @@ def split_into_sentences(text_blocks: list[str]) -> list[str]:
 
     cleaned_sentences = []
 
-    for block in text_blocks:
-        # 1. 先在整个文本块中过滤掉可能跨行的公式块 $$...$$
-        block = re.sub(r'\$\$.+?\$\$', '', block, flags=re.DOTALL)
+    # 1. 所有文本块以 NUL 拼接，一次过滤掉可能跨行的公式块 $$...$$
+    #    （markdown-it 会把输入中的 NUL 替换为 U+FFFD，文本块中不会出现 NUL）
+    corpus = "\0".join(text_blocks)
+    if '$$' in corpus:
+        corpus = _DISPLAY_MATH_RE.sub('', corpus)
 
-        # 2. 将处理后的文本块按换行符分割
-        sub_lines = block.split('\n')
+    # 2. 块边界与换行符同样视为行边界，一次分割为所有行
+    for text in corpus.replace('\0', '\n').split('\n'):
+        text = text.strip()
+        if not text:
+            continue
 
-        for text in sub_lines:
-            text = text.strip()
-            if not text:
-                continue
+        # 识别所有内联样式区间
+        style_ranges = find_inline_style_ranges(text)
 
-            # 识别所有内联样式区间
-            style_ranges = find_inline_style_ranges(text)
+        # 纯 ASCII 的行（如英文段落）不可能包含中文标点，使用更简单的等价模式
+        sentence_end_re = _SENTENCE_END_ASCII_RE if text.isascii() else _SENTENCE_END_RE
 
-            # 使用新的分句逻辑
+        if not style_ranges:
+            # 没有内联样式时句子边界就是各处句末标点的结束位置，
+            # 由 finditer 一次扫描整行，不再逐句调用边界查找
             pos = 0
-            while pos < len(text):
-                end_pos = find_sentence_boundary(text, pos, style_ranges)
-                sentence = text[pos:end_pos].strip()
-
+            for match in sentence_end_re.finditer(text):
+                sentence = ' '.join(text[pos:match.end()].split())
                 if sentence:
-                    # 将多个连续空格压缩为单个空格
-                    sentence = re.sub(r'\s+', ' ', sentence)
                     cleaned_sentences.append(sentence)
+                pos = match.end()
+            sentence = ' '.join(text[pos:].split())
+            if sentence:
+                cleaned_sentences.append(sentence)
+            continue
 
-                if end_pos == pos:
-                    # 防止无限循环
-                    pos += 1
-                else:
-                    pos = end_pos
+        style_index = build_style_index(style_ranges)
+
+        # 使用新的分句逻辑
+        pos = 0
+        while pos < len(text):
+            end_pos = find_sentence_boundary(text, pos, style_index, sentence_end_re)
+            # 将多个连续空格压缩为单个空格（split/join 由 C 实现，比正则替换更快）；
+            # split() 本身会丢弃首尾空白，无需再 strip() 复制一次
+            sentence = ' '.join(text[pos:end_pos].split())
+
+            if sentence:
+                cleaned_sentences.append(sentence)
+
+            if end_pos == pos:
+                # 防止无限循环
+                pos += 1
+            else:
+                pos = end_pos
 
     print(f"  - 成功分割出 {len(cleaned_sentences)} 个句子。")
     return cleaned_sentences
@@ -330,38 +558,121 @@ def write_to_txt(sentences: list[str], output_path: str, source_file_path: str):
     """
     print(f"正在写入结果到: {output_path}")
     try:
-        source_name = os.path.basename(source_file_path)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            if not sentences:
-                f.write("")  # 写入空文件
-            else:
-                tagged_lines = []
-                for idx, sentence in enumerate(sentences, start=1):
-                    tag = f"@@S{idx:06d}|{source_name}@@ "
-                    tagged_lines.append(tag + sentence)
-                f.write('\n'.join(tagged_lines) + '\n')
+        # 标签中的文件名与换行符预先编码，逐行直接写入缓冲区，不再拼接整个输出
+        source_tag = f"|{os.path.basename(source_file_path)}@@ ".encode('utf-8')
+        newline = os.linesep.encode('ascii')
+        # 1 MiB 写缓冲区，大文件也只需少量 write 系统调用
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.writelines(
+                b"@@S%06d" % idx + source_tag + sentence.encode('utf-8') + newline
+                for idx, sentence in enumerate(sentences, start=1)
+            )
     except Exception as e:
         print(f"❌ 错误: 写入文件时发生错误 -> {e}", file=sys.stderr)
         sys.exit(1)
 
 
-def main():
+def process_file(input_path: str, output_path: str) -> int:
+    """
+    处理单个 Markdown 文件：提取文本、分句并写入输出文件。
+
+    Args:
+        input_path (str): Markdown 文件路径。
+        output_path (str): 输出 txt 文件路径。
+
+    Returns:
+        int: 写入的句子数。
+    """
+    extracted_text = extract_text_from_markdown(input_path)
+    sentences_list = split_into_sentences(extracted_text)
+    write_to_txt(sentences_list, output_path, input_path)
+    return len(sentences_list)
+
+
+def process_directory(input_dir: str, output_dir: str, workers: Optional[int] = None) -> int:
+    """
+    使用多个进程并行处理目录（含子目录）中的所有 Markdown 文件。
+
+    解析和分句都是纯 CPU 计算，线程受 GIL 限制无法并行，因此按文件分配给进程池；
+    每个子进程启动时预先构建一次解析器，之后处理的文件都复用它。
+
+    Args:
+        input_dir (str): Markdown 文件所在目录。
+        output_dir (str): 输出目录，每个文件按其相对 input_dir 的路径输出为 <子目录>/<文件名>.txt，
+            不同子目录中的同名文件不会互相覆盖。
+        workers (Optional[int]): 进程数，为 None 时使用 CPU 核心数。
+
+    Returns:
+        int: 处理失败的文件数。
+    """
+    files = list_markdown_files(Path(input_dir))
+    if not files:
+        print(f"⚠️ 目录中没有 Markdown 文件: {input_dir}")
+        return 0
+
+    in_dir = Path(input_dir)
+    out_dir = Path(output_dir)
+    # 输出路径镜像源文件相对 input_dir 的目录结构，并预先创建所需的子目录
+    output_paths = {}
+    for path in files:
+        target_dir = out_dir / path.parent.relative_to(in_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        output_paths[path] = target_dir / f"{make_output_stem(path)}.txt"
+    print(f"📚 共 {len(files)} 个文件，开始并行处理...")
+
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=get_markdown_parser) as pool:
+        futures = {
+            pool.submit(process_file, str(path), str(output_paths[path])): path
+            for path in files
+        }
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                future.result()
+            except (Exception, SystemExit) as e:
+                # 读写失败时子进程内会调用 sys.exit，这里同样视为该文件处理失败
+                failed += 1
+                print(f"❌ 错误: 处理 {path} 失败 -> {e}", file=sys.stderr)
+    return failed
+
+
+def main(argv=None):
     """
     主函数，编排整个处理流程。
     """
     parser = argparse.ArgumentParser(
         description="智能处理 Markdown文件：忽略代码/表格，提取段落内容并按句分割。",
-        epilog="示例: python checker_process_markdown.py my_article.md output.txt"
+        epilog=(
+            "示例: python checker_process_markdown.py my_article.md output.txt\n"
+            "      python checker_process_markdown.py --batch ../source/_posts --output-dir output"
+        ),
+        formatter_class=argparse.RawDescriptionHelpFormatter,
     )
-    parser.add_argument("input_file", help="要处理的 Markdown 文件名及路径。")
-    parser.add_argument("output_file", help="导出的 txt 文件名及路径。")
-
-    args = parser.parse_args()
+    parser.add_argument("input_file", nargs="?", help="要处理的 Markdown 文件名及路径。")
+    parser.add_argument("output_file", nargs="?", help="导出的 txt 文件名及路径。")
+    parser.add_argument("--batch", metavar="DIR", help="并行处理该目录（含子目录）中的所有 Markdown 文件。")
+    parser.add_argument("--output-dir", metavar="OUT", help="批量模式的输出目录，默认为 output 目录。")
+    parser.add_argument("--workers", type=int, metavar="N", help="批量模式的进程数，默认为 CPU 核心数。")
+
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        if args.input_file or args.output_file:
+            parser.error("--batch 不能与 input_file/output_file 同时使用")
+        output_dir = args.output_dir or str(ensure_output_dir())
+        failed = process_directory(args.batch, output_dir, args.workers)
+        if failed:
+            print(f"\n⚠️ 处理完成，其中 {failed} 个文件失败。", file=sys.stderr)
+            sys.exit(1)
+        print(f"\n🎉全部处理完成！结果已保存至: {output_dir}")
+        return
+
+    if not args.input_file or not args.output_file:
+        parser.error("需要指定 input_file 和 output_file，或使用 --batch")
 
     # 核心处理流程
-    extracted_text = extract_text_from_markdown(args.input_file)
-    sentences_list = split_into_sentences(extracted_text)
-    write_to_txt(sentences_list, args.output_file, args.input_file)
+    process_file(args.input_file, args.output_file)
 
     print("\n🎉全部处理完成！结果已成功保存。")
 
@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import os
 from pathlib import Path
 import shutil
 
@@ -12,18 +13,24 @@ import shutil
 def clear_output_cache(base_dir: Path, output_name: str = "output") -> int:
     """清除 output 目录下的所有文件，并返回删除的文件数量。"""
     output_dir = base_dir / output_name
-    if not output_dir.exists():
-        return 0
-
     removed = 0
-    for entry in output_dir.iterdir():
-        try:
-            if entry.is_dir() and not entry.is_symlink():
-                shutil.rmtree(entry)
-            else:
-                entry.unlink(missing_ok=True)
-            removed += 1
-        except Exception:
-            # Best-effort cleanup; skip entries that cannot be removed.
-            continue
+    try:
+        # os.scandir 的 DirEntry 自带文件类型，判断目录无需再次 stat
+        it = os.scandir(output_dir)
+    except OSError:
+        return 0
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    shutil.rmtree(entry.path)
+                else:
+                    try:
+                        os.unlink(entry.path)
+                    except FileNotFoundError:
+                        pass
+                removed += 1
+            except Exception:
+                # Best-effort cleanup; skip entries that cannot be removed.
+                continue
     return removed
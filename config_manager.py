@@ -8,10 +8,28 @@
 
 from __future__ import annotations
 
+import functools
 import json
 from pathlib import Path
 from typing import Dict, Tuple, List, Any
 
+# 优先使用 C 实现的 orjson，未安装时回退到标准库
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+else:
+    json_loads = json.loads
+
+    def json_dumps(obj: Any) -> str:
+        return json.dumps(obj, indent=2, ensure_ascii=False)
+
 BASE_DIR = Path(__file__).resolve().parent
 CONFIG_PATH = BASE_DIR / "config.json"
 
@@ -23,21 +41,32 @@ REQUIRED_CONFIG_KEYS = [
 ]
 
 
+@functools.lru_cache(maxsize=4)
+def _parse_config_cached(path_str: str, mtime_ns: int, size: int) -> Dict[str, Any]:
+    # 以 (路径, 修改时间, 大小) 为键缓存解析结果；文件变化后键随之变化，自动重新解析。
+    # 解析失败时抛出异常，异常不会被缓存
+    return json_loads(Path(path_str).read_bytes())
+
+
 def load_config() -> Dict[str, Any]:
     """
     加载配置文件
 
+    文件的修改时间和大小未变化时直接使用缓存，不再重新读取和解析。
+
     Returns:
-        配置字典，如果文件不存在或解析失败则返回空字典
+        配置字典（副本，调用方可以自由修改），如果文件不存在或解析失败则返回空字典
     """
-    if not CONFIG_PATH.exists():
+    try:
+        st = CONFIG_PATH.stat()
+    except OSError:
         return {}
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        config = _parse_config_cached(str(CONFIG_PATH), st.st_mtime_ns, st.st_size)
     except Exception as e:
         print(f"⚠️ 警告：加载配置失败 {e}")
         return {}
+    return dict(config)
 
 
 def save_config(config: Dict[str, Any]) -> None:
@@ -49,9 +78,12 @@ def save_config(config: Dict[str, Any]) -> None:
     """
     try:
         with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+            f.write(json_dumps(config))
     except Exception as e:
         print(f"⚠️ 保存配置失败: {e}")
+    finally:
+        # 文件系统的时间精度较粗时，同一时刻内的两次写入可能得到相同的键，写入后总是清空缓存
+        _parse_config_cached.cache_clear()
 
 
 def get_posts_dir(config: Dict[str, Any] = None) -> Path:
@@ -9,9 +9,20 @@
 from __future__ import annotations
 
 import json
+import mmap
 import re
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from config_manager import json_loads
+
+
+# 整行匹配带标签的行：标签截止到第一个 "@@ "，其后到行尾为内容；
+# 与原先先去除行首空白再匹配一致，允许标签前有空白或 UTF-8 BOM（不跨行）
+_LABELED_LINE_RE = re.compile(
+    rb"^(?:[ \t\r\f\v]|\xef\xbb\xbf)*(@@S[^\n]*?@@ )([^\n]*)", re.MULTILINE)
+# 单行版本：标签前允许的空白和 BOM 与上面一致，匹配到标签前缀 "@@S" 为止
+_LABEL_PREFIX_RE = re.compile(rb"(?:[ \t\r\f\v]|\xef\xbb\xbf)*@@S")
 
 
 def split_label(line: str) -> Tuple[str, str]:
@@ -42,10 +53,16 @@ def parse_label(label: str) -> Tuple[str, str]:
     Returns:
         (标签, 文件名)
     """
-    match = re.match(r"^@@S\d+\|([^@]+)@@\s*$", label)
-    if not match:
+    # 格式固定为 @@S<数字>|<文件名>@@，直接切片解析
+    if not label.startswith("@@S"):
+        return "", ""
+    bar = label.find("|", 3)
+    if bar <= 3 or not label[3:bar].isdigit():
         return "", ""
-    return label, match.group(1)
+    end = label.find("@", bar + 1)
+    if end <= bar + 1 or not label.startswith("@@", end) or label[end + 2:].strip():
+        return "", ""
+    return label, label[bar + 1:end]
 
 
 def parse_ai_json(text: str) -> Dict[str, str]:
@@ -59,7 +76,8 @@ def parse_ai_json(text: str) -> Dict[str, str]:
         包含 original_text, error_type, description, checked_text 的字典
     """
     try:
-        data = json.loads(text)
+        # 已安装 orjson 时使用其 C 实现解析，失败时同样抛出 json.JSONDecodeError 的子类
+        data = json_loads(text)
         return {
             "original_text": data.get("original_text", ""),
             "error_type": data.get("error_type", ""),
@@ -76,6 +94,35 @@ def parse_ai_json(text: str) -> Dict[str, str]:
         }
 
 
+def _iter_labeled_lines(path: Path) -> Iterator[Tuple[str, str]]:
+    """
+    以二进制方式逐行读取文件，只解码带标签的行
+
+    Args:
+        path: 文件路径
+
+    Returns:
+        (标签, 内容) 元组的迭代器，内容为空的行会被跳过
+    """
+    match_prefix = _LABEL_PREFIX_RE.match
+    with open(path, "rb") as f:
+        for raw_line in f:
+            # 直接在原始字节上判断标签，不带标签的行不做任何解码或拷贝；
+            # 行首即为标签的常见情况不经过正则
+            if not raw_line.startswith(b"@@S"):
+                m = match_prefix(raw_line)
+                if m is None:
+                    continue
+                raw_line = raw_line[m.end() - 3:]
+            end = raw_line.find(b"@@ ", 3)
+            if end == -1:
+                continue
+            content = raw_line[end + 3:].decode("utf-8").rstrip()
+            if not content:
+                continue
+            yield raw_line[:end + 3].decode("utf-8"), content
+
+
 def load_change_out(path: Path) -> Dict[str, Dict[str, str]]:
     """
     加载 AI 处理结果文件
@@ -87,43 +134,67 @@ def load_change_out(path: Path) -> Dict[str, Dict[str, str]]:
         标签到数据的映射字典
     """
     data: Dict[str, Dict[str, str]] = {}
-    with open(path, "r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line:
-                continue
-            label, content = split_label(line)
-            if not label:
-                continue
-            parsed = parse_ai_json(content)
-            data[label] = {
-                "original_text": parsed["original_text"],
-                "error_type": parsed["error_type"],
-                "description": parsed["description"],
-                "checked_text": parsed["checked_text"],
-                "raw": content,
-            }
+    for label, content in _iter_labeled_lines(path):
+        parsed = parse_ai_json(content)
+        data[label] = {
+            "original_text": parsed["original_text"],
+            "error_type": parsed["error_type"],
+            "description": parsed["description"],
+            "checked_text": parsed["checked_text"],
+            "raw": content,
+        }
     return data
 
 
-def load_filtered_change_lines(path: Path, labels: set[str]) -> List[Tuple[str, str]]:
+def load_filtered_change_lines(path: Path, labels: Iterable[str]) -> List[Tuple[str, str]]:
     """
     加载过滤后的 change 文件行
 
     Args:
         path: change 文件路径
-        labels: 要保留的标签集合
+        labels: 要保留的标签，可直接传入字典的键视图，无需先复制成集合
 
     Returns:
         (标签, 句子) 元组列表
     """
+    wanted = {label.encode("utf-8") for label in labels}
+    if not wanted:
+        return []
+
     items: List[Tuple[str, str]] = []
-    with open(path, "r", encoding="utf-8") as f:
-        for raw_line in f:
-            line = raw_line.strip()
-            if not line:
-                continue
-            label, sentence = split_label(line)
-            if label and label in labels:
-                items.append((label, sentence))
+    with open(path, "rb") as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            return items
+        with mm:
+            # 在整个映射上由正则引擎扫描，只有命中的标签才会解码
+            for match in _LABELED_LINE_RE.finditer(mm):
+                if match.group(1) not in wanted:
+                    continue
+                sentence = match.group(2).rstrip().decode("utf-8")
+                if sentence:
+                    items.append((match.group(1).decode("utf-8"), sentence))
     return items
+
+
+def load_change_data(
+        change_path: Path,
+        change_out_path: Path,
+) -> Tuple[Dict[str, Dict[str, str]], List[Tuple[str, str]]]:
+    """
+    一次性加载 AI 处理结果和与之匹配的 change 文件行
+
+    Args:
+        change_path: change 文件路径
+        change_out_path: change_out 文件路径
+
+    Returns:
+        (标签到数据的映射字典, (标签, 句子) 元组列表)，
+        change_out 中没有内容时不会读取 change 文件
+    """
+    data = load_change_out(change_out_path)
+    if not data:
+        return data, []
+    return data, load_filtered_change_lines(change_path, data.keys())
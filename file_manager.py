@@ -8,8 +8,12 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import List, Optional, Dict
+import mmap
+import os
+from concurrent.futures import ThreadPoolExecutor
+from fnmatch import fnmatch
+from pathlib import Path, PurePath
+from typing import Iterable, Iterator, List, Optional, Dict, Set, Tuple
 
 BASE_DIR = Path(__file__).resolve().parent
 
@@ -37,22 +41,68 @@ def list_output_files(pattern: str = "*.txt") -> List[Path]:
         排序后的文件路径列表
     """
     output_dir = ensure_output_dir()
-    return sorted([p for p in output_dir.glob(pattern) if p.is_file()])
+    with os.scandir(output_dir) as it:
+        names = [
+            entry.path
+            for entry in it
+            if fnmatch(entry.name, pattern) and entry.is_file()
+        ]
+    return sorted(Path(name) for name in names)
+
+
+def _scan_files(
+        root: Path,
+        suffix: str = "",
+        dirs: Optional[List[str]] = None,
+) -> Iterator[str]:
+    """
+    使用 os.scandir 递归遍历目录，逐个返回文件路径
 
+    Args:
+        root: 起始目录
+        suffix: 文件名后缀过滤，为空时返回所有文件
+        dirs: 不为 None 时，追加遍历过的所有目录路径
 
-def list_markdown_files(posts_dir: Path) -> List[Path]:
+    Returns:
+        文件路径（字符串）的迭代器
+    """
+    # 与 Path.rglob 一致：Windows 上后缀不区分大小写（POST.MD 同样匹配），其他平台区分
+    suffix = os.path.normcase(suffix)
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        if dirs is not None:
+            dirs.append(current)
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    # 文件判断仍跟随符号链接：原先的 rglob 会返回指向文件的链接，
+                    # 改用 follow_symlinks=False 会让链接过来的文章从列表中消失
+                    elif os.path.normcase(entry.name).endswith(suffix) and entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def list_markdown_files(
+        posts_dir: Path,
+        dirs: Optional[List[str]] = None,
+) -> List[Path]:
     """
     列出文章目录中的所有 Markdown 文件
 
     Args:
         posts_dir: 文章目录路径
+        dirs: 不为 None 时，追加遍历过的所有目录路径（可用于判断目录是否变化）
 
     Returns:
         排序后的 Markdown 文件路径列表
     """
     if not posts_dir.exists():
         return []
-    return sorted([p for p in posts_dir.rglob("*.md") if p.is_file()])
+    return sorted(Path(p) for p in _scan_files(posts_dir, ".md", dirs))
 
 
 def make_output_stem(path: Path) -> str:
@@ -68,7 +118,74 @@ def make_output_stem(path: Path) -> str:
     return path.stem
 
 
-def resolve_md_path(filename: str, posts_dir: Path, cache: Dict[str, Path]) -> Optional[Path]:
+def dir_stamp(dirs: List[str]) -> Optional[Tuple[int, ...]]:
+    """
+    获取一组目录的 mtime 快照，用于判断遍历结果是否仍然有效
+
+    目录中增删、重命名条目都会更新该目录的 mtime，只需 stat 各个目录即可，无需重新遍历文件
+
+    Args:
+        dirs: 目录路径列表
+
+    Returns:
+        各目录 mtime（纳秒）组成的元组，任一目录无法访问时返回 None
+    """
+    try:
+        return tuple(os.stat(d).st_mtime_ns for d in dirs)
+    except OSError:
+        return None
+
+
+def build_md_index(
+        posts_dir: Path,
+        dirs: Optional[List[str]] = None,
+) -> Dict[str, List[Path]]:
+    """
+    遍历一次文章目录，建立 文件名 -> 路径列表 的索引
+
+    Args:
+        posts_dir: 文章目录
+        dirs: 不为 None 时，追加遍历过的所有目录路径（可用于判断目录是否变化）
+
+    Returns:
+        以文件名为键、同名文件路径列表为值的字典
+    """
+    index: Dict[str, List[Path]] = {}
+    if not posts_dir.exists():
+        return index
+    for path_str in _scan_files(posts_dir, dirs=dirs):
+        index.setdefault(os.path.basename(path_str), []).append(Path(path_str))
+    for paths in index.values():
+        paths.sort()
+    return index
+
+
+def lookup_md_index(index: Dict[str, List[Path]], filename: str) -> List[Path]:
+    """
+    在索引中查找文件，支持带相对目录的文件名（如 Git 模式的标签）
+
+    Args:
+        index: build_md_index 生成的索引
+        filename: 文件名或相对路径
+
+    Returns:
+        匹配的文件路径列表
+    """
+    parts = PurePath(filename).parts
+    if not parts:
+        return []
+    candidates = index.get(parts[-1], [])
+    if len(parts) == 1:
+        return list(candidates)
+    return [p for p in candidates if p.parts[-len(parts):] == parts]
+
+
+def resolve_md_path(
+        filename: str,
+        posts_dir: Path,
+        cache: Dict[str, Path],
+        index: Optional[Dict[str, List[Path]]] = None,
+) -> Optional[Path]:
     """
     解析 Markdown 文件路径
 
@@ -76,6 +193,7 @@ def resolve_md_path(filename: str, posts_dir: Path, cache: Dict[str, Path]) -> O
         filename: 文件名
         posts_dir: 文章目录
         cache: 路径缓存字典
+        index: 文件名索引，为 None 时现场建立
 
     Returns:
         解析后的文件路径，如果未找到则返回 None
@@ -84,8 +202,10 @@ def resolve_md_path(filename: str, posts_dir: Path, cache: Dict[str, Path]) -> O
     if filename in cache:
         return cache[filename]
 
-    # 在 posts_dir 中递归搜索
-    matches = [p for p in posts_dir.rglob(filename) if p.is_file()]
+    # 在文件名索引中查找
+    if index is None:
+        index = build_md_index(posts_dir)
+    matches = lookup_md_index(index, filename)
 
     if len(matches) == 1:
         cache[filename] = matches[0]
@@ -99,7 +219,59 @@ def resolve_md_path(filename: str, posts_dir: Path, cache: Dict[str, Path]) -> O
     return None
 
 
-def replace_sentence_in_file(path: Path, old_sentence: str, new_sentence: str) -> bool:
+def read_text_cached(path: Path, cache: Optional[Dict[Path, str]] = None) -> Optional[str]:
+    """
+    读取文件内容，提供缓存时同一文件只读取一次
+
+    Args:
+        path: 文件路径
+        cache: 文件内容缓存字典
+
+    Returns:
+        文件内容，读取失败时返回 None
+    """
+    if cache is not None:
+        content = cache.get(path)
+        if content is not None:
+            return content
+    try:
+        content = path.read_text(encoding="utf-8")
+    except Exception:
+        return None
+    if cache is not None:
+        cache[path] = content
+    return content
+
+
+def preload_text_files(
+        paths: Iterable[Path],
+        cache: Dict[Path, str],
+        max_workers: int = 8,
+) -> None:
+    """
+    使用线程池并发读取多个文件，结果写入内容缓存
+
+    Args:
+        paths: 文件路径集合
+        cache: 文件内容缓存字典
+        max_workers: 最大线程数
+    """
+    pending = [p for p in dict.fromkeys(paths) if p not in cache]
+    if not pending:
+        return
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        for path, content in zip(pending, executor.map(read_text_cached, pending)):
+            if content is not None:
+                cache[path] = content
+
+
+def replace_sentence_in_file(
+        path: Path,
+        old_sentence: str,
+        new_sentence: str,
+        cache: Optional[Dict[Path, str]] = None,
+        dirty: Optional[Set[Path]] = None,
+) -> bool:
     """
     在文件中替换句子
 
@@ -107,41 +279,120 @@ def replace_sentence_in_file(path: Path, old_sentence: str, new_sentence: str) -
         path: 文件路径
         old_sentence: 原句子
         new_sentence: 新句子
+        cache: 文件内容缓存字典，提供时复用已读取的内容并同步更新
+        dirty: 待写回文件集合，与 cache 同时提供时只修改内存，
+            由 flush_text_cache 统一写回
 
     Returns:
         是否成功替换
     """
-    try:
-        content = path.read_text(encoding="utf-8")
-    except Exception:
-        return False
+    return replace_sentences_in_file(
+        path, [(old_sentence, new_sentence)], cache, dirty
+    ) == 1
 
-    if old_sentence not in content:
-        return False
 
-    updated = content.replace(old_sentence, new_sentence, 1)
+def replace_sentences_in_file(
+        path: Path,
+        pairs: Iterable[Tuple[str, str]],
+        cache: Optional[Dict[Path, str]] = None,
+        dirty: Optional[Set[Path]] = None,
+) -> int:
+    """
+    在同一文件中依次替换多个句子，只读取和写入一次
+
+    每一对按顺序替换首次出现的位置，与逐个调用 replace_sentence_in_file 的结果相同。
+
+    Args:
+        path: 文件路径
+        pairs: (原句子, 新句子) 列表
+        cache: 文件内容缓存字典，提供时复用已读取的内容并同步更新
+        dirty: 待写回文件集合，与 cache 同时提供时只修改内存，
+            由 flush_text_cache 统一写回
+
+    Returns:
+        成功替换的句子数；写入失败时返回 0
+    """
+    content = read_text_cached(path, cache)
+    if content is None:
+        return 0
+
+    replaced = 0
+    for old_sentence, new_sentence in pairs:
+        pos = content.find(old_sentence)
+        if pos < 0:
+            continue
+        content = content[:pos] + new_sentence + content[pos + len(old_sentence):]
+        replaced += 1
+    if not replaced:
+        return 0
+
+    if cache is not None and dirty is not None:
+        cache[path] = content
+        dirty.add(path)
+        return replaced
 
     try:
-        path.write_text(updated, encoding="utf-8")
+        path.write_text(content, encoding="utf-8")
     except Exception:
-        return False
+        return 0
 
-    return True
+    if cache is not None:
+        cache[path] = content
+    return replaced
 
 
-def check_sentence_in_file(path: Path, sentence: str) -> bool:
+def flush_text_cache(cache: Dict[Path, str], dirty: Set[Path]) -> List[Path]:
+    """
+    将缓存中被修改过的文件写回磁盘
+
+    Args:
+        cache: 文件内容缓存字典
+        dirty: 待写回文件集合，写回成功的文件会被移除
+
+    Returns:
+        写回失败的文件路径列表
+    """
+    failed: List[Path] = []
+    for path in sorted(dirty):
+        try:
+            path.write_text(cache[path], encoding="utf-8")
+        except Exception:
+            failed.append(path)
+    dirty.intersection_update(failed)
+    return failed
+
+
+def check_sentence_in_file(
+        path: Path,
+        sentence: str,
+        cache: Optional[Dict[Path, str]] = None,
+) -> bool:
     """
     检查句子是否存在于文件中
 
     Args:
         path: 文件路径
         sentence: 要检查的句子
+        cache: 文件内容缓存字典
 
     Returns:
         句子是否存在
     """
+    if cache is not None:
+        content = read_text_cached(path, cache)
+        return content is not None and sentence in content
+
+    # 不使用缓存时直接在内存映射上按字节查找，无需把整个文件解码为字符串；
+    # UTF-8 编码具有自同步性，字节串匹配与解码后的子串匹配结果一致
+    needle = sentence.encode("utf-8")
     try:
-        content = path.read_text(encoding="utf-8")
-        return sentence in content
-    except Exception:
+        with open(path, "rb") as f:
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 空文件无法映射
+                return not needle
+            with mm:
+                return mm.find(needle) != -1
+    except OSError:
         return False
@@ -5,38 +5,19 @@
 
 from __future__ import annotations
 
-import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 import subprocess
 
-
-BASE_DIR = Path(__file__).resolve().parent
+from config_manager import get_posts_dir
 
 
 def load_posts_dir() -> Path:
-    config_path = BASE_DIR / "config.json"
-    default_path = BASE_DIR / "posts"
-
-    if not config_path.exists():
-        return default_path.resolve()
-
-    try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            config = json.load(f)
-            path_str = config.get("POSTS_DIR")
-            if path_str:
-                return (BASE_DIR / path_str).resolve()
-    except Exception as e:
-        print(f"Warning: Failed to load config: {e}")
-
-    return default_path.resolve()
-
-
-POSTS_DIR = load_posts_dir()
+    # 配置按文件修改时间缓存，重复调用只需一次 stat，配置修改后自动读取新的目录
+    return get_posts_dir()
 
 
 def wait_for_key(message: str = "按任意键退出...") -> None:
@@ -54,7 +35,7 @@ def wait_for_key(message: str = "按任意键退出...") -> None:
 def run_git(args: list[str], capture_output: bool = False) -> subprocess.CompletedProcess:
     return subprocess.run(
         ["git"] + args,
-        cwd=str(POSTS_DIR),
+        cwd=str(load_posts_dir()),
         text=True,
         encoding="utf-8",
         errors="replace",
@@ -63,8 +44,36 @@ def run_git(args: list[str], capture_output: bool = False) -> subprocess.Complet
     )
 
 
+def run_git_stream(args: list[str]) -> Iterator[str]:
+    """逐行返回 git 命令的输出，不在内存中缓存完整结果；stderr 与原先一样不显示"""
+    with subprocess.Popen(
+        ["git"] + args,
+        cwd=str(load_posts_dir()),
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+    ) as proc:
+        yield from proc.stdout
+
+
+def print_git_stream(args: list[str], header: str, word_diff: bool = False) -> None:
+    """边读取边打印 git 输出；有输出时才在第一行之前打印标题，word_diff 时在相邻的删除/新增之间补空格"""
+    printed = False
+    for line in run_git_stream(args):
+        if not printed:
+            print(header)
+            printed = True
+        if word_diff and "-]{+" in line:
+            line = line.replace("-]{+", "-] {+")
+        sys.stdout.write(line)
+    if printed:
+        sys.stdout.flush()
+
+
 def ensure_git_repo() -> bool:
-    git_dir = POSTS_DIR / ".git"
+    git_dir = load_posts_dir() / ".git"
     if git_dir.exists():
         return True
 
@@ -101,19 +110,9 @@ def has_pending_changes() -> Optional[bool]:
 
 def show_changes_summary() -> bool:
     print("以下是当前未提交的更改:")
-    diff_stat_result = run_git(
-        ["diff", "--stat", "--color=always"], capture_output=True)
-    if diff_stat_result.returncode == 0 and diff_stat_result.stdout:
-        print("变更统计:")
-        print(diff_stat_result.stdout.rstrip())
-
-    diff_result = run_git(["diff", "--word-diff=plain",
-                          "--color=always"], capture_output=True)
-    if diff_result.returncode == 0 and diff_result.stdout:
-        diff_output = diff_result.stdout.replace("-]{+", "-] {+")
-        print()
-        print("变更详情：")
-        print(diff_output.rstrip())
+    # 差异可能很大，边读取边输出，无需等待 git 生成完整结果
+    print_git_stream(["diff", "--stat", "--color=always"], "变更统计:")
+    print_git_stream(["diff", "--word-diff=plain", "--color=always"], "\n变更详情：", word_diff=True)
 
     try:
         choice = input("确认继续提交这些更改? (y/n): ").strip()
@@ -141,16 +140,17 @@ def get_commit_message() -> str:
 
 
 def main() -> int:
-    if not POSTS_DIR.exists():
-        print(f"POSTS_DIR 未找到: {POSTS_DIR}")
+    posts_dir = load_posts_dir()
+    if not posts_dir.exists():
+        print(f"POSTS_DIR 未找到: {posts_dir}")
         wait_for_key()
         return 1
 
     print("--- Git 自动提交助手已启动 ---")
-    print(f"工作目录: {POSTS_DIR}")
+    print(f"工作目录: {posts_dir}")
 
     try:
-        os.chdir(POSTS_DIR)
+        os.chdir(posts_dir)
     except OSError as e:
         print(f"切换目录失败: {e}")
         wait_for_key()
@@ -7,17 +7,22 @@
 
 from __future__ import annotations
 
+import functools
 import sys
 import time
 import threading
 import subprocess
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from checker_add import GitDiffExtractor
-from checker_ai import initialize_client, get_ai_response
+from checker_ai import initialize_client, compile_prefilter, submit_batch
 from checker_process_markdown import extract_text_from_markdown, split_into_sentences, write_to_txt
 from clear_output_cache import clear_output_cache
 from config_manager import load_config, save_config, get_posts_dir, validate_config, REQUIRED_CONFIG_KEYS
@@ -26,18 +31,37 @@ from file_manager import (
     ensure_output_dir,
     list_output_files,
     list_markdown_files,
+    build_md_index,
+    lookup_md_index,
+    dir_stamp,
     resolve_md_path,
     replace_sentence_in_file,
-    check_sentence_in_file,
 )
 from data_parser import (
     split_label as split_label_with_tag,
     parse_label,
-    load_change_out,
-    load_filtered_change_lines,
+    load_change_data,
 )
 
 BASE_DIR = Path(__file__).resolve().parent
+# 主题切换合并应用的等待时间（毫秒）
+THEME_APPLY_DELAY_MS = 50
+# 日志类文本框保留的最大行数
+LOG_MAX_BLOCKS = 5000
+# 日志缓冲刷新到界面的间隔（毫秒）
+LOG_FLUSH_INTERVAL_MS = 100
+# 进度条合并刷新的间隔（毫秒）
+PROGRESS_FLUSH_INTERVAL_MS = 50
+# AiWorker 发出进度信号的最小间隔（秒）
+PROGRESS_EMIT_INTERVAL = 0.05
+# 审查进度合并写入的等待时间（毫秒）
+REVIEW_PROGRESS_SAVE_DELAY_MS = 250
+# 同时运行的 git 进程数上限
+GIT_MAX_PROCESSES = 2
+# Git 仓库变化后合并刷新的等待时间（毫秒）
+GIT_WATCH_DELAY_MS = 200
+# AiWorker 每写入多少批结果刷新一次输出文件
+AI_FLUSH_INTERVAL = 32
 
 
 class ThemeManager(QtCore.QObject):
@@ -48,6 +72,13 @@ class ThemeManager(QtCore.QObject):
         self._app = app
         self._mode = "system"
         self._system_scheme = self._read_system_scheme()
+        # 最近一次应用的配色方案，未变化时跳过代价较高的 setStyleSheet
+        self._last_applied_scheme: Optional[str] = None
+        # 短时间内的多次主题切换合并为一次应用，避免反复重设整个样式表
+        self._apply_timer = QtCore.QTimer(self)
+        self._apply_timer.setSingleShot(True)
+        self._apply_timer.setInterval(THEME_APPLY_DELAY_MS)
+        self._apply_timer.timeout.connect(self.apply)
 
     def _read_system_scheme(self) -> str:
         try:
@@ -58,7 +89,7 @@ class ThemeManager(QtCore.QObject):
 
     def set_mode(self, mode: str) -> None:
         self._mode = mode
-        self.apply()
+        self.schedule_apply()
 
     def enable_system_tracking(self) -> None:
         hints = QtGui.QGuiApplication.styleHints()
@@ -67,52 +98,90 @@ class ThemeManager(QtCore.QObject):
     def _on_system_scheme_changed(self, scheme: QtCore.Qt.ColorScheme) -> None:
         self._system_scheme = "dark" if scheme == QtCore.Qt.ColorScheme.Dark else "light"
         if self._mode == "system":
-            self.apply()
+            self.schedule_apply()
 
     def current_scheme(self) -> str:
         if self._mode == "system":
             return self._system_scheme
         return self._mode
 
+    def schedule_apply(self) -> None:
+        """延迟应用主题；计时结束前的再次调用只会重新计时。"""
+        self._apply_timer.start()
+
     def apply(self) -> None:
+        self._apply_timer.stop()
         scheme = self.current_scheme()
+        if scheme == self._last_applied_scheme:
+            return
         self._app.setStyleSheet(build_qss(scheme))
+        self._last_applied_scheme = scheme
         self.theme_changed.emit()
 
 
+# 差异视图各类行的前景色
+DIFF_COLORS: Dict[str, Dict[str, str]] = {
+    "light": {
+        "added": "#28a745",
+        "removed": "#d73a49",
+        "header": "#586069",
+        "chunk": "#005cc5",
+    },
+    "dark": {
+        "added": "#2ea44f",
+        "removed": "#da3633",
+        "header": "#8b949e",
+        "chunk": "#79c0ff",
+    },
+}
+
+
+# 按行首字符分类差异行：首字符 -> ((前缀, 行类别), ...)，按顺序取第一个匹配的前缀
+_DIFF_LINE_KINDS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "+": (("+++", "header"), ("+", "added")),
+    "-": (("---", "header"), ("-", "removed")),
+    "@": (("@@", "chunk"),),
+    "d": (("diff", "header"),),
+}
+
+
 class DiffHighlighter(QtGui.QSyntaxHighlighter):
     def __init__(self, document: QtGui.QTextDocument, theme_manager: ThemeManager) -> None:
         super().__init__(document)
         self.theme_manager = theme_manager
-        self.theme_manager.theme_changed.connect(self.rehighlight)
+        # 每种配色方案的文本格式只构建一次，高亮每一行时直接复用
+        self._formats: Dict[str, Dict[str, QtGui.QTextCharFormat]] = {
+            scheme: self._build_formats(colors) for scheme, colors in DIFF_COLORS.items()
+        }
+        # 当前配色对应的格式表只在主题切换时更新，而不是每行都查询一次
+        self._active_formats = self._formats_for_current_scheme()
+        self.theme_manager.theme_changed.connect(self._on_theme_changed)
+
+    def _formats_for_current_scheme(self) -> Dict[str, QtGui.QTextCharFormat]:
+        return self._formats.get(self.theme_manager.current_scheme(), self._formats["light"])
+
+    def _on_theme_changed(self) -> None:
+        self._active_formats = self._formats_for_current_scheme()
+        self.rehighlight()
+
+    @staticmethod
+    def _build_formats(colors: Dict[str, str]) -> Dict[str, QtGui.QTextCharFormat]:
+        formats = {}
+        for key, color in colors.items():
+            fmt = QtGui.QTextCharFormat()
+            fmt.setForeground(QtGui.QColor(color))
+            formats[key] = fmt
+        return formats
 
     def highlightBlock(self, text: str) -> None:
-        scheme = self.theme_manager.current_scheme()
-        if scheme == "dark":
-            added_color = QtGui.QColor("#2ea44f")
-            removed_color = QtGui.QColor("#da3633")
-            header_color = QtGui.QColor("#8b949e")
-            chunk_color = QtGui.QColor("#79c0ff")
-        else:
-            added_color = QtGui.QColor("#28a745")
-            removed_color = QtGui.QColor("#d73a49")
-            header_color = QtGui.QColor("#586069")
-            chunk_color = QtGui.QColor("#005cc5")
-
-        if text.startswith("+"):
-            if text.startswith("+++"):
-                self.setFormat(0, len(text), header_color)
-            else:
-                self.setFormat(0, len(text), added_color)
-        elif text.startswith("-"):
-            if text.startswith("---"):
-                self.setFormat(0, len(text), header_color)
-            else:
-                self.setFormat(0, len(text), removed_color)
-        elif text.startswith("@@"):
-            self.setFormat(0, len(text), chunk_color)
-        elif text.startswith("diff"):
-            self.setFormat(0, len(text), header_color)
+        # 大多数上下文行的首字符不在表中，一次查表即可返回
+        candidates = _DIFF_LINE_KINDS.get(text[:1])
+        if candidates is None:
+            return
+        for prefix, kind in candidates:
+            if text.startswith(prefix):
+                self.setFormat(0, len(text), self._active_formats[kind])
+                return
 
 
 THEME_COLORS: Dict[str, Dict[str, str]] = {
@@ -153,6 +222,7 @@ THEME_COLORS: Dict[str, Dict[str, str]] = {
         "checkbox_checked_bg": "#0f6cbd",
         "checkbox_checked_border": "#0f6cbd",
         "tab_indicator": "#0f6cbd",
+        "button_padding": "6px 12px",
     },
     "dark": {
         "app_bg_start": "#1e1f24",
@@ -191,10 +261,17 @@ THEME_COLORS: Dict[str, Dict[str, str]] = {
         "checkbox_checked_bg": "#4f9dff",
         "checkbox_checked_border": "#4f9dff",
         "tab_indicator": "#4f9dff",
+        "button_padding": "5px 12px",
     },
 }
 
-LIGHT_QSS_TEMPLATE = """
+# 派生颜色在导入时一次性补齐，生成样式表时直接使用，无需复制颜色表
+for _colors in THEME_COLORS.values():
+    # 用于 URL 中的颜色值，# 需要转义为 %23
+    _colors["text_primary_uri"] = _colors["text_primary"].replace("#", "%23")
+del _colors
+
+QSS_TEMPLATE = """
 QWidget#AppRoot {{
     background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
         stop:0 {app_bg_start}, stop:1 {app_bg_end});
@@ -285,7 +362,7 @@ QPushButton {{
     color: {button_text};
     border: none;
     border-radius: 8px;
-    padding: 6px 12px;
+    padding: {button_padding};
 }}
 QPushButton:disabled {{
     background: {button_disabled_bg};
@@ -326,7 +403,7 @@ QProgressBar::chunk {{
     background: {progress_chunk};
     border-radius: 6px;
 }}
-QListWidget {{
+QListView {{
     background: {list_bg};
     border: 1px solid {list_border};
     border-radius: 10px;
@@ -349,170 +426,23 @@ QCheckBox::indicator:checked {{
 }}
 """
 
-DARK_QSS_TEMPLATE = """
-QWidget#AppRoot {{
-    background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-        stop:0 {app_bg_start}, stop:1 {app_bg_end});
-    color: {text_primary};
-}}
-QLabel#TitleLabel {{
-    font-size: 20px;
-    font-weight: 600;
-}}
-QLabel {{
-    color: {text_primary};
-}}
-QLabel#SubtitleLabel {{
-    color: {text_muted};
-}}
-QFrame#Card {{
-    background: {card_bg};
-    border: 1px solid {card_border};
-    border-radius: 10px;
-}}
-QDialog, QMessageBox {{
-    background: {card_bg};
-    color: {text_primary};
-}}
-QMessageBox QLabel {{
-    color: {text_primary};
-}}
-QMessageBox QTextEdit, QMessageBox QTextBrowser {{
-    background: {input_bg};
-    border: 1px solid {input_border};
-    border-radius: 6px;
-    color: {text_primary};
-}}
-QLineEdit, QPlainTextEdit, QTextEdit, QSpinBox, QDoubleSpinBox, QComboBox {{
-    background: {input_bg};
-    border: 1px solid {input_border};
-    border-radius: 8px;
-    padding: 6px 8px;
-    color: {text_primary};
-}}
-QLineEdit:focus, QPlainTextEdit:focus, QTextEdit:focus, QSpinBox:focus, QDoubleSpinBox:focus, QComboBox:focus {{
-    border: 1px solid {focus_border};
-}}
-QComboBox::drop-down {{
-    subcontrol-origin: padding;
-    subcontrol-position: top right;
-    width: 24px;
-    border-left: 1px solid {input_border};
-    border-top-right-radius: 8px;
-    border-bottom-right-radius: 8px;
-    background: {dropdown_bg};
-}}
-QComboBox::down-arrow {{
-    width: 8px;
-    height: 8px;
-}}
-QComboBox QAbstractItemView {{
-    border: 1px solid {combo_view_border};
-    border-radius: 0;
-    background: {combo_view_bg};
-    color: {text_primary};
-    selection-color: {selection_text};
-    selection-background-color: {selection_bg};
-    outline: 0;
-}}
-QSpinBox, QDoubleSpinBox {{
-    padding-right: 8px;
-}}
-QSpinBox::up-button, QDoubleSpinBox::up-button {{
-    width: 0px;
-    height: 0px;
-    border: none;
-    background: transparent;
-}}
-QSpinBox::down-button, QDoubleSpinBox::down-button {{
-    width: 0px;
-    height: 0px;
-    border: none;
-    background: transparent;
-}}
-QSpinBox::up-arrow, QSpinBox::down-arrow, QDoubleSpinBox::up-arrow, QDoubleSpinBox::down-arrow {{
-    width: 0px;
-    height: 0px;
-    image: none;
-}}
-QPushButton {{
-    background: {button_bg};
-    color: {button_text};
-    border: none;
-    border-radius: 8px;
-    padding: 5px 12px;
-}}
-QPushButton:disabled {{
-    background: {button_disabled_bg};
-    color: {button_disabled_text};
-}}
-QPushButton#GhostButton {{
-    background: transparent;
-    color: {ghost_text};
-    border: 1px solid {ghost_border};
-}}
-QPushButton#DestructiveButton {{
-    background: {danger_bg};
-    color: {danger_text};
-}}
-QTabWidget::pane {{
-    border: none;
-}}
-QTabBar::tab {{
-    background: transparent;
-    padding: 8px 16px;
-    margin-right: 8px;
-    border-bottom: 2px solid transparent;
-    color: {tab_text};
-}}
-QTabBar::tab:selected {{
-    border-bottom: 2px solid transparent;
-    color: {tab_active_text};
-}}
-QProgressBar {{
-    background: {progress_bg};
-    border: 1px solid {progress_border};
-    border-radius: 6px;
-    height: 14px;
-    text-align: center;
-    color: {progress_text};
-}}
-QProgressBar::chunk {{
-    background: {progress_chunk};
-    border-radius: 6px;
-}}
-QListWidget {{
-    background: {list_bg};
-    border: 1px solid {list_border};
-    border-radius: 10px;
-}}
-QCheckBox {{
-    spacing: 6px;
-    color: {checkbox_text};
-}}
-QCheckBox::indicator {{
-    width: 14px;
-    height: 14px;
-    border-radius: 3px;
-    border: 1px solid {checkbox_border};
-    background: {checkbox_bg};
-}}
-QCheckBox::indicator:checked {{
-    border: 1px solid {checkbox_checked_border};
-    background: {checkbox_checked_bg};
-}}
-"""
+
+@functools.lru_cache(maxsize=4)
+def get_theme_colors(scheme: str) -> Mapping[str, str]:
+    # 返回只读视图：结果会被缓存并在多处共享，调用方不能修改共享的颜色表
+    return MappingProxyType(THEME_COLORS.get(scheme, THEME_COLORS["light"]))
 
 
-def get_theme_colors(scheme: str) -> Dict[str, str]:
-    return THEME_COLORS.get(scheme, THEME_COLORS["light"])
+@functools.lru_cache(maxsize=None)
+def get_tab_indicator_color(scheme: str) -> QtGui.QColor:
+    # 每种配色方案的指示条颜色只解析一次
+    return QtGui.QColor(get_theme_colors(scheme)["tab_indicator"])
 
 
+@functools.lru_cache(maxsize=None)
 def build_qss(scheme: str) -> str:
-    colors = dict(get_theme_colors(scheme))
-    colors["text_primary_uri"] = colors["text_primary"].replace("#", "%23")
-    template = DARK_QSS_TEMPLATE if scheme == "dark" else LIGHT_QSS_TEMPLATE
-    return template.format_map(colors)
+    # 每种配色方案的样式表只生成一次，之后切换主题时直接复用
+    return QSS_TEMPLATE.format_map(get_theme_colors(scheme))
 
 
 class AiWorker(QtCore.QThread):
@@ -557,42 +487,107 @@ class AiWorker(QtCore.QThread):
             change_path, out_path = self._prepare_inputs()
             if self._stop_event.is_set():
                 return
-            lines = change_path.read_text(encoding="utf-8").splitlines()
-            if not lines:
+            # 先只数行数用于进度显示，正文随后逐批流式读取，不把整个文件读入内存
+            with open(change_path, "rb") as fh:
+                total = sum(1 for _ in fh)
+            if not total:
                 self.failed.emit("没有可处理的内容")
                 return
-            total = len(lines)
             self.prepared.emit(str(change_path), str(out_path), total)
 
             client = initialize_client(self._config)
             delay = float(self._config.get("REQUEST_DELAY_SECONDS", 0.1))
-
-            with open(out_path, "w", encoding="utf-8") as f_out:
-                for idx, raw_line in enumerate(lines, start=1):
-                    if self._stop_event.is_set():
-                        self.log.emit("已被用户停止")
+            # 与命令行版本共用 BATCH_SIZE / OLLAMA_NUM_PARALLEL 配置：
+            # 每次请求打包的行数，以及同时在途的请求数
+            batch_size = max(1, int(self._config.get("BATCH_SIZE", 1)))
+            num_parallel = max(1, int(self._config.get("OLLAMA_NUM_PARALLEL", 1)))
+            response_cache: Dict[str, str] = {}
+            prefilter = compile_prefilter(self._config)
+
+            # 循环中反复使用的函数预先绑定为局部变量，省去每次的全局/属性查找
+            split_label = split_label_with_tag
+            sleep = time.sleep
+            stop_is_set = self._stop_event.is_set
+            pause_is_set = self._pause_event.is_set
+            wait_if_paused = self._wait_if_paused
+
+            # newline="\n" 让逐行读取与上面按字节计数的分行方式一致
+            with open(change_path, "r", encoding="utf-8", newline="\n") as f_in, \
+                    open(out_path, "w", encoding="utf-8") as f_out, \
+                    ThreadPoolExecutor(max_workers=num_parallel) as pool:
+                # 按提交顺序排队的 (批次, future)，保证输出顺序与输入一致、进度单调递增
+                in_flight = deque()
+                exhausted = False
+                done = 0
+                # 进度信号按时间节流，跨线程排队的信号数量不随批次数增长
+                emitted = 0
+                next_emit = 0.0
+                written_batches = 0
+                while True:
+                    # 补满在途请求；暂停只在提交新请求时生效，已发出的请求照常完成
+                    while not exhausted and len(in_flight) < num_parallel:
+                        if stop_is_set():
+                            break
+                        if in_flight and not pause_is_set():
+                            break
+                        wait_if_paused()
+                        if stop_is_set():
+                            break
+                        batch = [
+                            split_label(line.strip())
+                            for line in islice(f_in, batch_size)
+                        ]
+                        if not batch:
+                            exhausted = True
+                            break
+                        future, requested = submit_batch(
+                            pool, client, [content for _, content in batch],
+                            self._config, response_cache, prefilter,
+                        )
+                        in_flight.append((batch, future))
+                        if requested:
+                            sleep(delay)
+
+                    if stop_is_set():
+                        # 取消尚未开始的请求，已经发出的请求完成后仍写入结果
+                        for _, future in in_flight:
+                            future.cancel()
+                    if not in_flight:
                         break
-                    self._wait_if_paused()
-                    content = raw_line.strip()
-                    label, content = split_label_with_tag(content)
-                    if not content:
-                        self.progress.emit(idx, total)
+
+                    batch, future = in_flight.popleft()
+                    if future.cancelled():
                         continue
-                    result = get_ai_response(client, content, self._config)
-                    f_out.write(f"{label}{result}\n")
-                    f_out.flush()
-                    self.progress.emit(idx, total)
-                    time.sleep(delay)
+                    # 整批拼成一个字符串写入；每 AI_FLUSH_INTERVAL 批或停止时才刷新到磁盘，
+                    # 其余交给文件缓冲，with 退出时会完成最终刷新
+                    f_out.write("".join(
+                        label + result + "\n"
+                        for (label, content), result in zip(batch, future.result())
+                        if content
+                    ))
+                    written_batches += 1
+                    if written_batches % AI_FLUSH_INTERVAL == 0 or stop_is_set():
+                        f_out.flush()
+                    done += len(batch)
+                    now = time.monotonic()
+                    if now >= next_emit:
+                        self.progress.emit(done, total)
+                        emitted = done
+                        next_emit = now + PROGRESS_EMIT_INTERVAL
+
+                # 节流期间未发出的最终进度在结束时补发
+                if emitted != done:
+                    self.progress.emit(done, total)
+                if self._stop_event.is_set():
+                    self.log.emit("已被用户停止")
 
             self.finished.emit(str(change_path), str(out_path))
         except Exception as exc:
             self.failed.emit(str(exc))
 
     def _wait_if_paused(self) -> None:
-        while not self._pause_event.is_set():
-            if self._stop_event.is_set():
-                return
-            time.sleep(0.15)
+        # stop() 会同时置位 _pause_event，因此这里无需超时轮询即可及时退出
+        self._pause_event.wait()
 
     def _prepare_inputs(self) -> Tuple[Path, Path]:
         output_dir = ensure_output_dir()
@@ -600,11 +595,10 @@ class AiWorker(QtCore.QThread):
             self.log.emit(f"正在扫描 Git 变更：{self._posts_dir}")
             extractor = GitDiffExtractor(self._posts_dir)
             changes = extractor.extract_all_changes()
-            if not changes:
-                raise RuntimeError("未检测到 Git 变更")
             change_path = output_dir / "changes.txt"
             out_path = output_dir / "changes_out.txt"
-            extractor.save_to_file(changes, change_path, include_metadata=True)
+            if not extractor.save_to_file(changes, change_path, include_metadata=True):
+                raise RuntimeError("未检测到 Git 变更")
             return change_path, out_path
 
         if not self._input_path:
@@ -638,6 +632,8 @@ class ReviewItem:
         self.filename = filename
         self.error_type = error_type
         self.description = description
+        # 预检查时在文件原始字节中查找，编码只做一次
+        self.sentence_bytes = sentence.encode("utf-8")
 
 
 class AnimatedTabBar(QtWidgets.QTabBar):
@@ -645,8 +641,7 @@ class AnimatedTabBar(QtWidgets.QTabBar):
         super().__init__(parent)
         self._indicator_pos = 0.0
         self._indicator_width = 0.0
-        self._indicator_color = QtGui.QColor(
-            THEME_COLORS["light"]["tab_indicator"])
+        self._indicator_color = get_tab_indicator_color("light")
 
         self._pos_anim = QtCore.QPropertyAnimation(self, b"indicatorPos", self)
         self._width_anim = QtCore.QPropertyAnimation(
@@ -660,6 +655,8 @@ class AnimatedTabBar(QtWidgets.QTabBar):
         self._width_anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
 
     def set_indicator_color(self, color: QtGui.QColor) -> None:
+        if color == self._indicator_color:
+            return
         self._indicator_color = color
         self.update()
 
@@ -698,15 +695,15 @@ class AnimatedTabBar(QtWidgets.QTabBar):
             return
         if self._indicator_width <= 0:
             return
+        # 指示条是贴底的 2px 水平条，按整数像素直接填充矩形，
+        # 无需抗锯齿和画笔，动画每一帧的绘制开销最小
         painter = QtGui.QPainter(self)
-        painter.setRenderHint(QtGui.QPainter.Antialiasing, True)
-        pen = QtGui.QPen(self._indicator_color)
-        pen.setWidth(2)
-        painter.setPen(pen)
-        y = self.height() - 1
-        painter.drawLine(
-            QtCore.QPointF(self._indicator_pos, y),
-            QtCore.QPointF(self._indicator_pos + self._indicator_width, y),
+        painter.fillRect(
+            round(self._indicator_pos),
+            self.height() - 2,
+            round(self._indicator_width),
+            2,
+            self._indicator_color,
         )
         painter.end()
 
@@ -742,10 +739,67 @@ class MainWindow(QtWidgets.QMainWindow):
         self.worker: Optional[AiWorker] = None
         self.review_items: List[ReviewItem] = []
         self.failed_items: List[ReviewItem] = []
+        # failed_items 中已有的标签，用于 O(1) 去重
+        self.failed_labels: Set[str] = set()
+        self.review_change_path: Optional[Path] = None
+        self.review_out_path: Optional[Path] = None
+        self.review_auto_cleanup = False
+        # 待写入的审查进度，由单次计时器合并写入
+        self._pending_review_progress: Optional[Tuple[Path, Path, int]] = None
+        self._review_progress_timer = QtCore.QTimer(self)
+        self._review_progress_timer.setSingleShot(True)
+        self._review_progress_timer.setInterval(REVIEW_PROGRESS_SAVE_DELAY_MS)
+        self._review_progress_timer.timeout.connect(self._flush_review_progress)
         self.review_index = 0
         self.review_md_cache: Dict[str, Path] = {}
+        # 审查期间读取过的 Markdown 原始字节：路径 -> ((修改时间, 大小), 内容)，文件变化后重新读取
+        self.review_md_contents: Dict[Path, Tuple[Tuple[int, int], bytes]] = {}
+        # 加载审查文件后在后台线程预读的原文件，浏览到对应条目时再取结果，界面线程不等待整批读取
+        self._md_read_pool: Optional[ThreadPoolExecutor] = None
+        self._md_preload: Dict[Path, Future] = {}
+        # 文章目录的文件名索引，审查时按需建立一次，目录内容变化或修改配置后重建
+        self.review_md_index: Optional[Dict[str, List[Path]]] = None
+        # 建立索引时遍历过的目录及其 mtime 快照，目录未变化时索引可继续使用
+        self.review_md_index_dirs: List[str] = []
+        self.review_md_index_stamp: Optional[Tuple[int, ...]] = None
         self._tab_fade_anim: Optional[QtCore.QPropertyAnimation] = None
+        # 每个标签页复用同一个透明度效果和动画，只在淡入期间启用效果
+        self._tab_fades: Dict[
+            QtWidgets.QWidget,
+            Tuple[QtWidgets.QGraphicsOpacityEffect, QtCore.QPropertyAnimation],
+        ] = {}
         self._tab_bar: Optional[AnimatedTabBar] = None
+        self._tab_stack: Optional[QtWidgets.QStackedWidget] = None
+        # 每次刷新 Git 页面递增，用于丢弃过期的异步结果
+        self._git_refresh_id = 0
+        # 正在运行的 git 进程数，以及等待启动的 (参数, 回调) 队列
+        self._git_running = 0
+        self._git_queue: deque = deque()
+        # Git 页面不可见时只做标记，切换到该页面时再执行 git 命令刷新
+        self._git_tab_dirty = True
+        # 监视 .git 目录，仓库状态变化（暂存、提交、切换分支等）时合并为一次刷新
+        self._git_watcher = QtCore.QFileSystemWatcher(self)
+        self._git_watch_timer = QtCore.QTimer(self)
+        self._git_watch_timer.setSingleShot(True)
+        self._git_watch_timer.setInterval(GIT_WATCH_DELAY_MS)
+        self._git_watch_timer.timeout.connect(self._on_git_repo_changed)
+        self._git_watcher.fileChanged.connect(self._git_watch_timer.start)
+        self._git_watcher.directoryChanged.connect(self._git_watch_timer.start)
+        # 日志先缓存，计时结束后一次追加，连续输出的多行只触发一次排版
+        self._log_buffer: List[str] = []
+        # 时间戳只精确到秒，同一秒内的日志复用已格式化的字符串
+        self._log_ts_second = -1
+        self._log_ts_str = ""
+        self._log_timer = QtCore.QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_timer.timeout.connect(self._flush_log)
+        # 进度更新同样合并：只记录最新值，计时结束后统一刷新一次进度条和标签
+        self._progress_pending: Optional[Tuple[int, int]] = None
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(PROGRESS_FLUSH_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._flush_progress)
 
         self._build_ui()
         self._refresh_config_ui()
@@ -783,6 +837,8 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tabs.setDocumentMode(True)
         self._tab_bar = AnimatedTabBar()
         self.tabs.setTabBar(self._tab_bar)
+        # QTabWidget 内部的页面栈在其生命周期内不变，只查找一次
+        self._tab_stack = self.tabs.findChild(QtWidgets.QStackedWidget)
         self.tabs.currentChanged.connect(self._on_tab_changed)
 
         self.run_tab = self._build_run_tab()
@@ -811,13 +867,19 @@ class MainWindow(QtWidgets.QMainWindow):
         if self._tab_bar is not None:
             self._tab_bar.animate_to(index)
         self._fade_in_tab(index)
+        # 切回运行页时补上隐藏期间缓存的日志
+        self._flush_log()
+        if self._git_tab_dirty and self.tabs.widget(index) is self.git_tab:
+            self._refresh_git_ui()
 
     def _fade_in_tab(self, index: int) -> None:
-        stack = self.tabs.findChild(QtWidgets.QStackedWidget)
+        stack = self._tab_stack
         if not stack:
             return
         if self._tab_fade_anim is not None and self._tab_fade_anim.state() == QtCore.QAbstractAnimation.Running:
+            # stop() 不会触发 finished，需要手动关闭上一个标签页的效果
             self._tab_fade_anim.stop()
+            self._tab_fade_anim.targetObject().setEnabled(False)
         width = stack.width()
         if width <= 0:
             return
@@ -832,20 +894,9 @@ class MainWindow(QtWidgets.QMainWindow):
         new_widget.show()
         new_widget.raise_()
 
-        effect = QtWidgets.QGraphicsOpacityEffect(new_widget)
+        effect, anim = self._tab_fade_for(new_widget)
         effect.setOpacity(0.0)
-        new_widget.setGraphicsEffect(effect)
-
-        anim = QtCore.QPropertyAnimation(effect, b"opacity", new_widget)
-        anim.setDuration(360)
-        anim.setStartValue(0.0)
-        anim.setEndValue(1.0)
-        anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
-
-        def _finalize() -> None:
-            new_widget.setGraphicsEffect(None)
-
-        anim.finished.connect(_finalize)
+        effect.setEnabled(True)
 
         stack.setUpdatesEnabled(True)
         stack.update()
@@ -853,13 +904,34 @@ class MainWindow(QtWidgets.QMainWindow):
         self._tab_fade_anim = anim
         anim.start()
 
+    def _tab_fade_for(
+        self, widget: QtWidgets.QWidget
+    ) -> Tuple[QtWidgets.QGraphicsOpacityEffect, QtCore.QPropertyAnimation]:
+        fade = self._tab_fades.get(widget)
+        if fade is not None:
+            return fade
+
+        effect = QtWidgets.QGraphicsOpacityEffect(widget)
+        # 禁用的效果不会离屏渲染，动画结束后标签页按原样直接绘制
+        effect.setEnabled(False)
+        widget.setGraphicsEffect(effect)
+
+        anim = QtCore.QPropertyAnimation(effect, b"opacity", widget)
+        anim.setDuration(360)
+        anim.setStartValue(0.0)
+        anim.setEndValue(1.0)
+        anim.setEasingCurve(QtCore.QEasingCurve.OutCubic)
+        anim.finished.connect(lambda: effect.setEnabled(False))
+
+        fade = (effect, anim)
+        self._tab_fades[widget] = fade
+        return fade
+
     def _apply_tab_indicator_color(self) -> None:
         if self._tab_bar is None:
             return
         scheme = self.theme_manager.current_scheme()
-        colors = get_theme_colors(scheme)
-        color = QtGui.QColor(colors["tab_indicator"])
-        self._tab_bar.set_indicator_color(color)
+        self._tab_bar.set_indicator_color(get_tab_indicator_color(scheme))
 
     def _on_theme_mode_change(self, *_: object) -> None:
         if self.system_theme_check.isChecked():
@@ -966,6 +1038,10 @@ class MainWindow(QtWidgets.QMainWindow):
         log_layout.setContentsMargins(16, 14, 16, 14)
         self.log_view = QtWidgets.QPlainTextEdit()
         self.log_view.setReadOnly(True)
+        # 限制日志行数，长时间运行时由 Qt 自动丢弃最早的行，追加开销不随历史增长
+        self.log_view.setMaximumBlockCount(LOG_MAX_BLOCKS)
+        # 日志只追加在末尾，复用同一个光标直接插入文本
+        self._log_cursor = QtGui.QTextCursor(self.log_view.document())
         log_layout.addWidget(QtWidgets.QLabel("日志"))
         log_layout.addWidget(self.log_view)
         layout.addWidget(log_card, stretch=1)
@@ -1010,8 +1086,14 @@ class MainWindow(QtWidgets.QMainWindow):
 
         content_layout = QtWidgets.QHBoxLayout()
 
-        self.review_list = QtWidgets.QListWidget()
-        self.review_list.currentRowChanged.connect(self._show_review_item)
+        # 模型/视图列表：整表一次性设置字符串，不为每行创建条目对象
+        self.review_model = QtCore.QStringListModel(self)
+        self.review_list = QtWidgets.QListView()
+        self.review_list.setModel(self.review_model)
+        self.review_list.setUniformItemSizes(True)
+        self.review_list.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.review_list.selectionModel().currentRowChanged.connect(
+            lambda current, _previous: self._show_review_item(current.row()))
         content_layout.addWidget(self.review_list, stretch=1)
 
         detail_card = self._build_card()
@@ -1164,12 +1246,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.git_output = QtWidgets.QPlainTextEdit()
         self.git_output.setReadOnly(True)
+        self.git_output.setMaximumBlockCount(LOG_MAX_BLOCKS)
         self.git_output.setMaximumHeight(150)
         output_layout.addWidget(QtWidgets.QLabel("Git 状态"))
         output_layout.addWidget(self.git_output)
 
         self.git_diff_view = QtWidgets.QPlainTextEdit()
         self.git_diff_view.setReadOnly(True)
+        # 内容只由程序整体替换，关闭撤销记录，避免撤销栈保留整份差异的副本
+        self.git_diff_view.setUndoRedoEnabled(False)
         self.git_diff_view.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
         font = QtGui.QFont("Consolas", 10)
         if not font.exactMatch():
@@ -1190,18 +1275,21 @@ class MainWindow(QtWidgets.QMainWindow):
         self.input_file_field.setEnabled(not is_git)
         self.input_browse_btn.setEnabled(not is_git)
         if is_git:
+            output_dir = ensure_output_dir()
             self.output_change_field.setText(
-                str(ensure_output_dir() / "changes.txt"))
+                str(output_dir / "changes.txt"))
             self.output_out_field.setText(
-                str(ensure_output_dir() / "changes_out.txt"))
+                str(output_dir / "changes_out.txt"))
         else:
             path_text = self.input_file_field.text().strip()
             if path_text:
+                # 输出目录每次只确认一次，两个输出路径共用
+                output_dir = ensure_output_dir()
                 stem = Path(path_text).stem
                 self.output_change_field.setText(
-                    str(ensure_output_dir() / f"{stem}.txt"))
+                    str(output_dir / f"{stem}.txt"))
                 self.output_out_field.setText(
-                    str(ensure_output_dir() / f"{stem}_out.txt"))
+                    str(output_dir / f"{stem}_out.txt"))
             else:
                 self.output_change_field.setText("")
                 self.output_out_field.setText("")
@@ -1249,11 +1337,12 @@ class MainWindow(QtWidgets.QMainWindow):
             expected_change_path = output_dir / f"{stem}.txt"
             expected_out_path = output_dir / f"{stem}_out.txt"
 
+        self._flush_review_progress()
         progress_change, progress_out, _ = load_review_progress()
         if progress_change and progress_out:
             if (str(Path(progress_change).resolve()) == str(expected_change_path.resolve()) and
                     str(Path(progress_out).resolve()) == str(expected_out_path.resolve())):
-                clear_review_progress()
+                self._clear_review_progress()
                 self._log(f"已清除现有的审查进度记录")
 
         self.progress_bar.setValue(0)
@@ -1283,20 +1372,34 @@ class MainWindow(QtWidgets.QMainWindow):
     def _on_prepared(self, change_path: str, out_path: str, total: int) -> None:
         self.output_change_field.setText(change_path)
         self.output_out_field.setText(out_path)
+        self._progress_pending = None
         self.progress_bar.setRange(0, total)
         self.progress_label.setText(f"处理中 0 / {total}")
 
     def _update_progress(self, current: int, total: int) -> None:
+        self._progress_pending = (current, total)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _flush_progress(self) -> None:
+        self._progress_timer.stop()
+        if self._progress_pending is None:
+            return
+        current, total = self._progress_pending
+        self._progress_pending = None
         self.progress_bar.setValue(current)
         self.progress_label.setText(f"处理中 {current} / {total}")
 
     def _on_finished(self, change_path: str, out_path: str) -> None:
+        # 先显示最后一次进度，再覆盖为结束状态
+        self._flush_progress()
         self._log(f"完成。输出：{out_path}")
         self.progress_label.setText("已完成")
         self.worker = None
         self._populate_review_defaults(change_path, out_path)
 
     def _on_failed(self, message: str) -> None:
+        self._flush_progress()
         self._log(f"失败：{message}")
         self.progress_label.setText("失败")
         self.worker = None
@@ -1308,8 +1411,35 @@ class MainWindow(QtWidgets.QMainWindow):
         )
 
     def _log(self, message: str) -> None:
-        timestamp = QtCore.QDateTime.currentDateTime().toString("HH:mm:ss")
-        self.log_view.appendPlainText(f"[{timestamp}] {message}")
+        # 按墙上时间取整秒，与显示的时分秒保持一致
+        second = int(time.time())
+        if second != self._log_ts_second:
+            self._log_ts_second = second
+            self._log_ts_str = time.strftime("%H:%M:%S", time.localtime(second))
+        self._log_buffer.append(f"[{self._log_ts_str}] {message}")
+        # 只有缓冲区从空变为非空时才启动计时，空闲时计时器不会运行
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self) -> None:
+        if not self._log_buffer:
+            return
+        if not self.log_view.isVisible():
+            # 日志所在的标签页不可见时不更新控件，只保留最近的日志，切换回来时再一次性追加
+            if len(self._log_buffer) > LOG_MAX_BLOCKS:
+                del self._log_buffer[:-LOG_MAX_BLOCKS]
+            return
+        text = "\n".join(self._log_buffer)
+        self._log_buffer.clear()
+        if not self.log_view.document().isEmpty():
+            text = "\n" + text
+        # 与 appendPlainText 一样：原本停在底部时继续跟随最新日志
+        bar = self.log_view.verticalScrollBar()
+        at_bottom = bar.value() == bar.maximum()
+        self._log_cursor.movePosition(QtGui.QTextCursor.End)
+        self._log_cursor.insertText(text)
+        if at_bottom:
+            bar.setValue(bar.maximum())
 
     def _populate_review_defaults(self, change_path: str, out_path: str) -> None:
         self.review_change_field.setText(change_path)
@@ -1335,19 +1465,23 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "审查", "所选文件不存在")
             return
 
-        change_out_data = load_change_out(out_path)
+        change_out_data, filtered_lines = load_change_data(change_path, out_path)
         if not change_out_data:
             QtWidgets.QMessageBox.warning(self, "审查", "未找到 AI 输出条目")
             return
 
-        filtered_lines = load_filtered_change_lines(
-            change_path, set(change_out_data.keys()))
         if not filtered_lines:
             QtWidgets.QMessageBox.warning(self, "审查", "未找到匹配的标签")
             return
 
         self.review_items = []
         self.failed_items = []
+        self.failed_labels = set()
+        # 每处理一条都要保存进度，路径和是否自动清理在加载时确定一次
+        self.review_change_path = change_path
+        self.review_out_path = out_path
+        self.review_auto_cleanup = (
+            change_path.name == "changes.txt" and out_path.name == "changes_out.txt")
         for label, sentence in filtered_lines:
             _, filename = parse_label(label)
             ai_info = change_out_data.get(label, {})
@@ -1358,16 +1492,23 @@ class MainWindow(QtWidgets.QMainWindow):
             self.review_items.append(ReviewItem(
                 label, sentence, origin, suggestion, filename, error_type, description))
 
-        self.review_list.clear()
+        rows = []
         for item in self.review_items:
             preview = item.origin or item.sentence
-            preview = preview[:60] + ("..." if len(preview) > 60 else "")
-            list_item = QtWidgets.QListWidgetItem(
-                f"{item.filename} | {preview}")
-            self.review_list.addItem(list_item)
+            # 只有超长时才截断拼接，短句直接使用原字符串
+            if len(preview) > 60:
+                preview = preview[:60] + "..."
+            rows.append(f"{item.filename} | {preview}")
+        self.review_model.setStringList(rows)
 
         self.review_md_cache.clear()
+        # 文件内容缓存按 mtime 校验、文件名索引按目录 mtime 校验，重新加载审查文件时无需丢弃
+        if (self.review_md_index is not None
+                and dir_stamp(self.review_md_index_dirs) != self.review_md_index_stamp):
+            self.review_md_index = None
+        self._preload_review_files()
         self.review_index = 0
+        self._flush_review_progress()
         progress_change, progress_out, progress_index = load_review_progress()
         if progress_change == str(change_path.resolve()) and progress_out == str(out_path.resolve()):
             if 0 <= progress_index < len(self.review_items):
@@ -1379,9 +1520,9 @@ class MainWindow(QtWidgets.QMainWindow):
                 if resume == QtWidgets.QMessageBox.StandardButton.Yes:
                     self.review_index = progress_index
                 else:
-                    clear_review_progress()
+                    self._clear_review_progress()
 
-        self.review_list.setCurrentRow(self.review_index)
+        self._select_review_row(self.review_index)
         self._show_review_item(self.review_index)
 
     def _show_review_item(self, index: int) -> None:
@@ -1398,11 +1539,14 @@ class MainWindow(QtWidgets.QMainWindow):
         md_path = self._resolve_md_path(item.filename)
         found = False
         if md_path:
-            found = check_sentence_in_file(md_path, item.sentence)
+            # 直接在原始字节上查找，无需解码整个文件；UTF-8 具有自同步性，结果与按字符串查找一致
+            content = self._read_md_cached(md_path)
+            found = content is not None and item.sentence_bytes in content
 
         if not found:
             # 如果没找到，记录并自动跳转到下一条
-            if not any(f.label == item.label for f in self.failed_items):
+            if item.label not in self.failed_labels:
+                self.failed_labels.add(item.label)
                 self.failed_items.append(item)
             QtCore.QTimer.singleShot(0, self._advance_review)
             return
@@ -1418,6 +1562,28 @@ class MainWindow(QtWidgets.QMainWindow):
         self.review_suggestion.setPlainText(item.suggestion)
         self.review_edit.setPlainText("")
 
+    def _read_md_cached(self, md_path: Path) -> Optional[bytes]:
+        # 同一文件的多个条目只读取一次；文件在外部被编辑后按修改时间和大小判断并重新读取
+        future = self._md_preload.pop(md_path, None)
+        # 尚未开始的预读直接取消并在这里读取；已开始的只需等待这一个文件
+        if future is not None and not future.cancel():
+            entry = future.result()
+            if entry is not None:
+                self.review_md_contents[md_path] = entry
+        try:
+            st = md_path.stat()
+        except OSError:
+            self.review_md_contents.pop(md_path, None)
+            return None
+        cached = self.review_md_contents.get(md_path)
+        if cached is not None and cached[0] == (st.st_mtime_ns, st.st_size):
+            return cached[1]
+        entry = _read_bytes_with_stamp(md_path)
+        if entry is None:
+            return None
+        self.review_md_contents[md_path] = entry
+        return entry[1]
+
     def _use_suggestion(self) -> None:
         if not self.review_items:
             return
@@ -1438,6 +1604,9 @@ class MainWindow(QtWidgets.QMainWindow):
             QtWidgets.QMessageBox.warning(self, "审查", "未找到文件")
             return
 
+        # 文件即将被改写，下次访问时重新读取
+        self.review_md_contents.pop(md_path, None)
+        self._md_preload.pop(md_path, None)
         if not replace_sentence_in_file(md_path, item.sentence, new_text):
             QtWidgets.QMessageBox.warning(
                 self, "审查", "未找到对应句子，请手动更新"
@@ -1453,15 +1622,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self._advance_review()
 
     def _advance_review(self) -> None:
-        change_path = Path(self.review_change_field.text())
-        out_path = Path(self.review_out_field.text())
+        change_path = self.review_change_path
+        out_path = self.review_out_path
         next_index = self.review_index + 1
-        save_review_progress(change_path, out_path, next_index)
         if next_index >= len(self.review_items):
-            clear_review_progress()
+            self._clear_review_progress()
 
             # 成功结束后自动删除 changes.txt 和 changes_out.txt
-            if change_path.name == "changes.txt" and out_path.name == "changes_out.txt":
+            if self.review_auto_cleanup:
                 try:
                     change_path.unlink(missing_ok=True)
                     out_path.unlink(missing_ok=True)
@@ -1482,19 +1650,77 @@ class MainWindow(QtWidgets.QMainWindow):
 
             QtWidgets.QMessageBox.information(self, "审查", info)
             return
-        self.review_list.setCurrentRow(next_index)
+        self._schedule_review_progress_save(change_path, out_path, next_index)
+        self._select_review_row(next_index)
+
+    def _schedule_review_progress_save(self, change_path: Path, out_path: Path, next_index: int) -> None:
+        # 连续审查时只记录最新进度，计时结束后写入一次
+        self._pending_review_progress = (change_path, out_path, next_index)
+        self._review_progress_timer.start()
+
+    def _flush_review_progress(self) -> None:
+        self._review_progress_timer.stop()
+        if self._pending_review_progress is not None:
+            save_review_progress(*self._pending_review_progress)
+            self._pending_review_progress = None
+
+    def _clear_review_progress(self) -> None:
+        # 丢弃尚未写入的进度，避免计时器在清除之后又重新写出进度文件
+        self._review_progress_timer.stop()
+        self._pending_review_progress = None
+        clear_review_progress()
+
+    def closeEvent(self, event: QtGui.QCloseEvent) -> None:
+        self._flush_review_progress()
+        if self._md_read_pool is not None:
+            self._md_read_pool.shutdown(wait=False, cancel_futures=True)
+        super().closeEvent(event)
+
+    def _select_review_row(self, row: int) -> None:
+        self.review_list.setCurrentIndex(self.review_model.index(row))
+
+    def _ensure_md_index(self) -> Dict[str, List[Path]]:
+        if self.review_md_index is None:
+            dirs: List[str] = []
+            self.review_md_index = build_md_index(self.posts_dir, dirs)
+            self.review_md_index_dirs = dirs
+            self.review_md_index_stamp = dir_stamp(dirs)
+        return self.review_md_index
+
+    def _preload_review_files(self) -> None:
+        # 加载审查文件时在后台线程并发读取所有能唯一确定路径的原文件，界面线程只提交任务不等待；
+        # 有多个同名文件的条目仍在浏览到时再让用户选择
+        self._cancel_md_preload()
+        index = self._ensure_md_index()
+        for filename in dict.fromkeys(item.filename for item in self.review_items):
+            path = resolve_md_path(filename, self.posts_dir, self.review_md_cache, index)
+            if path is None or path in self.review_md_contents or path in self._md_preload:
+                continue
+            if self._md_read_pool is None:
+                self._md_read_pool = ThreadPoolExecutor(max_workers=8)
+            self._md_preload[path] = self._md_read_pool.submit(_read_bytes_with_stamp, path)
+
+    def _cancel_md_preload(self) -> None:
+        for future in self._md_preload.values():
+            future.cancel()
+        self._md_preload.clear()
 
     def _resolve_md_path(self, filename: str) -> Optional[Path]:
         """
         GUI 特有的 Markdown 路径解析，使用对话框与用户交互
         """
+        # 文章目录只遍历一次，之后的查找都使用文件名索引
+        self._ensure_md_index()
+
         # 先尝试使用通用的解析函数
-        path = resolve_md_path(filename, self.posts_dir, self.review_md_cache)
+        path = resolve_md_path(
+            filename, self.posts_dir, self.review_md_cache, self.review_md_index
+        )
         if path:
             return path
 
         # 如果有多个匹配项，使用 GUI 对话框让用户选择
-        matches = [p for p in self.posts_dir.rglob(filename) if p.is_file()]
+        matches = lookup_md_index(self.review_md_index, filename)
         if len(matches) > 1:
             items = [str(p) for p in matches]
             selection, ok = QtWidgets.QInputDialog.getItem(
@@ -1527,6 +1753,10 @@ class MainWindow(QtWidgets.QMainWindow):
     def _refresh_config_ui(self) -> None:
         self.config = load_config()
         self.posts_dir = get_posts_dir(self.config)
+        self.review_md_cache.clear()
+        self.review_md_contents.clear()
+        self._cancel_md_preload()
+        self.review_md_index = None
         self.host_field.setText(str(self.config.get("OLLAMA_HOST", "")))
         self.model_field.setText(str(self.config.get("OLLAMA_MODEL", "")))
         self.delay_spin.setValue(
@@ -1539,6 +1769,7 @@ class MainWindow(QtWidgets.QMainWindow):
         self.prompt_field.setPlainText(
             str(self.config.get("SYSTEM_PROMPT", "")))
         self._update_run_mode()
+        self._watch_git_repo()
         self._refresh_git_ui()
 
     def _reload_config_ui(self) -> None:
@@ -1574,16 +1805,52 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _refresh_git_ui(self) -> None:
         self.git_repo_label.setText(f"仓库：{self.posts_dir}")
-        output = []
-        diff_output = []
+        if self.tabs.currentWidget() is not self.git_tab:
+            self._git_tab_dirty = True
+            return
+        self._git_tab_dirty = False
+        # 新的刷新开始后，仍在进行的旧刷新结果直接丢弃
+        self._git_refresh_id += 1
+        refresh_id = self._git_refresh_id
 
         if not (self.posts_dir / ".git").exists():
-            output.append("不是 Git 仓库")
-            self.git_output.setPlainText("\n".join(output))
+            self.git_output.setPlainText("不是 Git 仓库")
             self.git_diff_view.setPlainText("")
             return
 
-        status = self._run_git(["status", "--porcelain"], capture_output=True)
+        # 命令依次异步执行，界面在等待 git 期间保持响应；
+        # 未暂存变更的摘要和完整差异由同一个 git diff 进程一次输出
+        commands = [
+            # 不获取可选锁，避免 status 刷新索引文件后再次触发仓库监视
+            ["--no-optional-locks", "status", "--porcelain"],
+            ["diff", "--stat", "--patch"],
+            ["diff", "--cached"],
+        ]
+        results: List[subprocess.CompletedProcess] = []
+        unstaged: List[subprocess.CompletedProcess] = []
+
+        def _next(result: Optional[subprocess.CompletedProcess] = None) -> None:
+            if refresh_id != self._git_refresh_id:
+                return
+            if result is not None:
+                results.append(result)
+            if len(results) == 2:
+                diff_stat, unstaged_diff = _split_stat_patch(results[1])
+                unstaged.append(unstaged_diff)
+                self._show_git_status(results[0], diff_stat)
+            if len(results) < len(commands):
+                self._run_git_async(commands[len(results)], _next)
+            else:
+                self._show_git_diff(results[2], unstaged[0])
+
+        _next()
+
+    def _show_git_status(
+        self,
+        status: subprocess.CompletedProcess,
+        diff_stat: subprocess.CompletedProcess,
+    ) -> None:
+        output = []
         if status.returncode == 0:
             if status.stdout.strip():
                 output.append("检测到未提交的变更")
@@ -1595,81 +1862,207 @@ class MainWindow(QtWidgets.QMainWindow):
             if status.stderr:
                 output.append(status.stderr.strip())
 
-        diff_stat = self._run_git(["diff", "--stat"], capture_output=True)
         if diff_stat.returncode == 0 and diff_stat.stdout:
             output.append("\n变更摘要：")
             output.append(diff_stat.stdout.strip())
 
         self.git_output.setPlainText("\n".join(output))
 
-        # 填充完整差异
-        staged_diff = self._run_git(["diff", "--cached"], capture_output=True)
-        if staged_diff.returncode == 0 and staged_diff.stdout.strip():
-            diff_output.append("=== 已暂存的变更 (Staged) ===")
-            diff_output.append(staged_diff.stdout.strip())
-
-        unstaged_diff = self._run_git(["diff"], capture_output=True)
-        if unstaged_diff.returncode == 0 and unstaged_diff.stdout.strip():
-            if diff_output:
-                diff_output.append("\n")
-            diff_output.append("=== 未暂存的变更 (Unstaged) ===")
-            diff_output.append(unstaged_diff.stdout.strip())
-
-        if not diff_output:
-            self.git_diff_view.setPlainText("无差异内容")
-        else:
-            self.git_diff_view.setPlainText("\n".join(diff_output))
+    def _show_git_diff(
+        self,
+        staged_diff: subprocess.CompletedProcess,
+        unstaged_diff: subprocess.CompletedProcess,
+    ) -> None:
+        # 填充完整差异：各段直接插入文档，不再先拼接成一个大字符串
+        sections = [
+            ("=== 已暂存的变更 (Staged) ===", staged_diff),
+            ("=== 未暂存的变更 (Unstaged) ===", unstaged_diff),
+        ]
+        self.git_diff_view.clear()
+        cursor = QtGui.QTextCursor(self.git_diff_view.document())
+        cursor.beginEditBlock()
+        wrote = False
+        for header, result in sections:
+            if result.returncode != 0:
+                continue
+            text = result.stdout.strip()
+            if not text:
+                continue
+            if wrote:
+                cursor.insertText("\n\n\n")
+            cursor.insertText(header)
+            cursor.insertText("\n")
+            cursor.insertText(text)
+            wrote = True
+        if not wrote:
+            cursor.insertText("无差异内容")
+        cursor.endEditBlock()
+
+    def _watch_git_repo(self) -> None:
+        watched = self._git_watcher.files() + self._git_watcher.directories()
+        if watched:
+            self._git_watcher.removePaths(watched)
+        git_dir = _resolve_git_dir(self.posts_dir / ".git")
+        if git_dir is None:
+            return
+        # git 通过重命名 index.lock 等方式原子替换文件，会使文件监视失效，
+        # 因此同时监视 .git 目录本身，并在每次变化后重新添加
+        paths = [str(git_dir)]
+        paths += [str(git_dir / name) for name in ("index", "HEAD") if (git_dir / name).exists()]
+        self._git_watcher.addPaths(paths)
+
+    def _on_git_repo_changed(self) -> None:
+        self._watch_git_repo()
+        self._refresh_git_ui()
 
     def _git_init_repo(self) -> None:
         if (self.posts_dir / ".git").exists():
             QtWidgets.QMessageBox.information(self, "Git", "仓库已初始化")
             return
-        result = self._run_git(["init"], capture_output=True)
-        if result.returncode == 0:
-            self._refresh_git_ui()
-            QtWidgets.QMessageBox.information(self, "Git", "仓库已初始化")
-        else:
-            QtWidgets.QMessageBox.warning(
-                self, "Git", result.stderr or "初始化失败")
+
+        def _done(result: subprocess.CompletedProcess) -> None:
+            if result.returncode == 0:
+                # 初始化前没有 .git 目录可以监视，需要重新设置监视并手动刷新
+                self._watch_git_repo()
+                self._refresh_git_ui()
+                QtWidgets.QMessageBox.information(self, "Git", "仓库已初始化")
+            else:
+                QtWidgets.QMessageBox.warning(
+                    self, "Git", result.stderr or "初始化失败")
+
+        self._run_git_action(["init"], _done)
 
     def _git_stage_all(self) -> None:
-        result = self._run_git(["add", "."], capture_output=True)
-        if result.returncode == 0:
-            self._refresh_git_ui()
-            QtWidgets.QMessageBox.information(self, "Git", "已暂存全部变更")
-        else:
-            QtWidgets.QMessageBox.warning(self, "Git", result.stderr or "暂存失败")
+        def _done(result: subprocess.CompletedProcess) -> None:
+            if result.returncode == 0:
+                QtWidgets.QMessageBox.information(self, "Git", "已暂存全部变更")
+            else:
+                QtWidgets.QMessageBox.warning(self, "Git", result.stderr or "暂存失败")
+
+        self._run_git_action(["add", "."], _done)
 
     def _git_commit(self) -> None:
         message = self.git_message_field.text().strip()
         if not message:
             message = QtCore.QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm:ss")
             message = f"Auto-commit on {message}"
-        result = self._run_git(["commit", "-m", message], capture_output=True)
-        if result.returncode == 0:
-            self._refresh_git_ui()
-            QtWidgets.QMessageBox.information(self, "Git", f"已提交：{message}")
-        else:
-            QtWidgets.QMessageBox.warning(self, "Git", result.stderr or "提交失败")
-
-    def _run_git(self, args: List[str], capture_output: bool = False) -> subprocess.CompletedProcess:
-        return subprocess.run(
-            ["git"] + args,
-            cwd=str(self.posts_dir),
-            text=True,
-            encoding="utf-8",
-            errors="replace",
-            stdout=subprocess.PIPE if capture_output else None,
-            stderr=subprocess.PIPE if capture_output else None,
-        )
+
+        def _done(result: subprocess.CompletedProcess) -> None:
+            if result.returncode == 0:
+                QtWidgets.QMessageBox.information(self, "Git", f"已提交：{message}")
+            else:
+                QtWidgets.QMessageBox.warning(self, "Git", result.stderr or "提交失败")
+
+        self._run_git_action(["commit", "-m", message], _done)
+
+    def _run_git_action(
+        self,
+        args: List[str],
+        callback: Callable[[subprocess.CompletedProcess], None],
+    ) -> None:
+        # 初始化、暂存、提交同样在后台执行；执行期间禁用操作按钮，避免重复点击同时运行多个写操作
+        buttons = (self.git_init_btn, self.git_stage_btn, self.git_commit_btn)
+        for button in buttons:
+            button.setEnabled(False)
+
+        def _done(result: subprocess.CompletedProcess) -> None:
+            for button in buttons:
+                button.setEnabled(True)
+            callback(result)
+
+        self._run_git_async(args, _done)
+
+    def _run_git_async(
+        self,
+        args: List[str],
+        callback: Callable[[subprocess.CompletedProcess], None],
+    ) -> None:
+        """
+        使用 QProcess 在后台执行 git 命令，输出边产生边读入缓冲区，结束后回调
+
+        Args:
+            args: git 子命令及参数
+            callback: 命令结束后调用，参数为包含退出码与输出文本的 subprocess.CompletedProcess
+        """
+        # 同时运行的 git 进程数有上限，超出的命令排队，等前面的进程结束后再启动
+        if self._git_running >= GIT_MAX_PROCESSES:
+            self._git_queue.append((args, callback))
+            return
+        self._git_running += 1
+
+        proc = QtCore.QProcess(self)
+        proc.setWorkingDirectory(str(self.posts_dir))
+        stdout = bytearray()
+        # 及时读出管道数据，大的 diff 不会因管道写满而阻塞 git
+        proc.readyReadStandardOutput.connect(
+            lambda: stdout.extend(proc.readAllStandardOutput().data()))
+
+        def _done(returncode: int, stderr: str) -> None:
+            stdout.extend(proc.readAllStandardOutput().data())
+            proc.deleteLater()
+            self._git_running -= 1
+            if self._git_queue:
+                self._run_git_async(*self._git_queue.popleft())
+            callback(subprocess.CompletedProcess(
+                ["git"] + args, returncode, _decode_process_output(bytes(stdout)), stderr))
+
+        proc.finished.connect(
+            lambda code, _status: _done(
+                code, _decode_process_output(proc.readAllStandardError().data())))
+        proc.errorOccurred.connect(
+            lambda error: _done(-1, proc.errorString())
+            if error == QtCore.QProcess.ProcessError.FailedToStart else None)
+        proc.start("git", args)
+
+
+def _resolve_git_dir(dot_git: Path) -> Optional[Path]:
+    # 子模块和工作树中的 .git 是文件，内容为 "gitdir: <路径>"，指向真正的仓库目录
+    if dot_git.is_dir():
+        return dot_git
+    try:
+        text = dot_git.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        return None
+    if not text.startswith("gitdir:"):
+        return None
+    git_dir = dot_git.parent / text[len("gitdir:"):].strip()
+    return git_dir if git_dir.is_dir() else None
+
+
+def _split_stat_patch(
+    result: subprocess.CompletedProcess,
+) -> Tuple[subprocess.CompletedProcess, subprocess.CompletedProcess]:
+    # git diff --stat --patch 先输出摘要，空一行后是完整差异，按第一处差异头拆成两份结果
+    stat, sep, patch = result.stdout.partition("\n\ndiff --git ")
+    if sep:
+        stat += "\n"
+        patch = "diff --git " + patch
+    return (
+        subprocess.CompletedProcess(result.args, result.returncode, stat, result.stderr),
+        subprocess.CompletedProcess(result.args, result.returncode, patch, result.stderr),
+    )
+
+
+def _read_bytes_with_stamp(path: Path) -> Optional[Tuple[Tuple[int, int], bytes]]:
+    # 先取 stat 再读取：读取期间文件被修改时，下次检查会发现时间戳不一致并重新读取
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size), path.read_bytes()
+    except OSError:
+        return None
+
+
+def _decode_process_output(data: bytes) -> str:
+    # 与 subprocess 的 text 模式一致：UTF-8 解码并统一换行符
+    return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
 
 
 def main() -> int:
     app = QtWidgets.QApplication(sys.argv)
-    font = QtGui.QFont("Noto Sans CJK", 10)
-    if not font.exactMatch():
-        font = QtGui.QFont("Microsoft YaHei", 10)
-    app.setFont(font)
+    # 在字体数据库的族名集合中查找，只构造最终选中的字体
+    families = set(QtGui.QFontDatabase.families())
+    family = "Noto Sans CJK" if "Noto Sans CJK" in families else "Microsoft YaHei"
+    app.setFont(QtGui.QFont(family, 10))
 
     theme_manager = ThemeManager(app)
     theme_manager.enable_system_tracking()
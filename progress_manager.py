@@ -8,32 +8,67 @@
 
 from __future__ import annotations
 
-import configparser
+import functools
+import os
 from pathlib import Path
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
 BASE_DIR = Path(__file__).resolve().parent
 PROGRESS_FILE = BASE_DIR / "review_progress.ini"
 PROGRESS_SECTION = "review_progress"
+# 路径在导入时固定，预先转成字符串供 os 函数直接使用
+_PROGRESS_FILE_STR = str(PROGRESS_FILE)
 
+# 最近一次成功写入的进度文件内容，内容未变化时跳过写入
+_last_saved_text: Optional[str] = None
 
-def load_review_progress() -> Tuple[str, str, int]:
+
+def _parse_progress_file(text: str) -> Optional[Dict[str, str]]:
     """
-    加载审查进度
+    解析 INI 格式的进度文件，只读取 [review_progress] 节
+
+    Args:
+        text: 进度文件内容
 
     Returns:
-        (change_file 路径, change_out_file 路径, 下一个索引)
+        键值字典，如果不存在该节则返回 None
     """
-    if not PROGRESS_FILE.exists():
-        return "", "", 0
+    fields: Optional[Dict[str, str]] = None
+    in_section = False
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        if not line or line[0] in "#;":
+            continue
+        if line[0] == "[" and line[-1] == "]":
+            in_section = line[1:-1].strip() == PROGRESS_SECTION
+            if in_section and fields is None:
+                fields = {}
+            continue
+        if in_section:
+            key, sep, value = line.partition("=")
+            if sep:
+                fields[key.strip().lower()] = value.strip()
+    return fields
+
+
+@functools.lru_cache(maxsize=1)
+def _load_progress_cached(path_str: str, mtime_ns: int, size: int) -> Tuple[str, str, int]:
+    """
+    读取并解析进度文件，结果按 (路径, 修改时间, 大小) 缓存
+
+    Args:
+        path_str: 进度文件路径
+        mtime_ns: 文件修改时间（纳秒），仅用作缓存键
+        size: 文件大小，仅用作缓存键
 
-    config = configparser.ConfigParser()
+    Returns:
+        (change_file 路径, change_out_file 路径, 下一个索引)
+    """
     try:
-        config.read(PROGRESS_FILE, encoding="utf-8")
-        if PROGRESS_SECTION not in config:
+        section = _parse_progress_file(Path(path_str).read_text(encoding="utf-8"))
+        if section is None:
             return "", "", 0
 
-        section = config[PROGRESS_SECTION]
         change_path = section.get("change_file", "")
         change_out_file = section.get("change_out_file", "")
         next_index = int(section.get("next_index", "0"))
@@ -42,6 +77,22 @@ def load_review_progress() -> Tuple[str, str, int]:
         return "", "", 0
 
 
+def load_review_progress() -> Tuple[str, str, int]:
+    """
+    加载审查进度
+
+    文件的修改时间和大小未变化时直接使用缓存，不再重新读取和解析。
+
+    Returns:
+        (change_file 路径, change_out_file 路径, 下一个索引)
+    """
+    try:
+        st = os.stat(_PROGRESS_FILE_STR)
+    except OSError:
+        return "", "", 0
+    return _load_progress_cached(_PROGRESS_FILE_STR, st.st_mtime_ns, st.st_size)
+
+
 def save_review_progress(change_path: Path, change_out_file: Path, next_index: int) -> None:
     """
     保存审查进度
@@ -51,28 +102,46 @@ def save_review_progress(change_path: Path, change_out_file: Path, next_index: i
         change_out_file: change_out 文件路径
         next_index: 下一个要处理的索引
     """
-    config = configparser.ConfigParser()
-    config[PROGRESS_SECTION] = {
-        "change_file": str(change_path),
-        "change_out_file": str(change_out_file),
-        "next_index": str(max(0, next_index)),
-    }
+    # 与 configparser 的输出格式保持一致，旧的进度文件可以继续读取
+    text = (
+        f"[{PROGRESS_SECTION}]\n"
+        f"change_file = {change_path}\n"
+        f"change_out_file = {change_out_file}\n"
+        f"next_index = {max(0, next_index)}\n"
+        "\n"
+    )
+    global _last_saved_text
+    if text == _last_saved_text and os.path.exists(_PROGRESS_FILE_STR):
+        return
+    # 先写临时文件再原子替换，写入中途中断也不会留下不完整的进度文件
+    tmp_path = _PROGRESS_FILE_STR + ".tmp"
     try:
-        with open(PROGRESS_FILE, "w", encoding="utf-8") as f:
-            config.write(f)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_path, _PROGRESS_FILE_STR)
+        _last_saved_text = text
     except Exception as e:
+        _last_saved_text = None
         print(f"⚠️ 保存进度失败: {e}")
+    finally:
+        # 文件系统时间戳精度较粗时，快速连续保存可能得到相同的修改时间和大小
+        _load_progress_cached.cache_clear()
 
 
 def clear_review_progress() -> None:
     """
     清除审查进度文件
     """
+    global _last_saved_text
+    _last_saved_text = None
     try:
-        if PROGRESS_FILE.exists():
-            PROGRESS_FILE.unlink()
+        os.remove(_PROGRESS_FILE_STR)
+    except FileNotFoundError:
+        pass
     except Exception as e:
         print(f"⚠️ 清除进度失败: {e}")
+    finally:
+        _load_progress_cached.cache_clear()
 
 
 def has_review_progress() -> bool:
@@ -82,4 +151,4 @@ def has_review_progress() -> bool:
     Returns:
         是否存在未完成的审查进度
     """
-    return PROGRESS_FILE.exists()
+    return os.path.exists(_PROGRESS_FILE_STR)
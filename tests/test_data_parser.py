@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+数据解析模块测试
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_parser import load_change_data, load_change_out, load_filtered_change_lines  # noqa: E402
+
+
+class LabeledLinePrefixTest(unittest.TestCase):
+    """标签前带空白或 BOM 的行在 change 与 change_out 两个文件中都应被识别"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        tmp_dir = Path(self._tmp.name)
+        self.change_path = tmp_dir / "changes.txt"
+        self.change_out_path = tmp_dir / "changes_out.txt"
+        result = json.dumps({"checked_text": "改正后"}, ensure_ascii=False)
+        self.change_path.write_bytes(
+            "\ufeff@@S000001|a.md@@ 第一句\n"
+            "  \t@@S000002|a.md@@ 第二句\n"
+            "@@S000003|a.md@@ 第三句\r\n".encode("utf-8"))
+        self.change_out_path.write_bytes(
+            (f"\ufeff@@S000001|a.md@@ {result}\n"
+             f"  \t@@S000002|a.md@@ {result}\n"
+             f"@@S000003|a.md@@ {result}\r\n").encode("utf-8"))
+        self.labels = ["@@S000001|a.md@@ ", "@@S000002|a.md@@ ", "@@S000003|a.md@@ "]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_change_out_accepts_prefix(self):
+        data = load_change_out(self.change_out_path)
+        self.assertEqual(list(data), self.labels)
+        self.assertEqual(data["@@S000002|a.md@@ "]["checked_text"], "改正后")
+
+    def test_change_lines_accept_prefix(self):
+        lines = load_filtered_change_lines(self.change_path, self.labels)
+        self.assertEqual(
+            lines, list(zip(self.labels, ["第一句", "第二句", "第三句"])))
+
+    def test_both_files_agree(self):
+        data, lines = load_change_data(self.change_path, self.change_out_path)
+        self.assertEqual([label for label, _ in lines], list(data))
+
+
+if __name__ == "__main__":
+    unittest.main()